@@ -0,0 +1,58 @@
+import asyncio
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from page_object.async_home_page import AsyncHomePage
+from page_object.base_page import BasePage
+from page_object.booking_page import BookingComponent
+from utils.adaptive_timeouts import timeouts
+from utils.constants_ui import UIConstants
+
+
+class AsyncBookingComponent(BasePage):
+    """Async counterparts of the BookingComponent methods for the async Playwright API"""
+
+    BOOKING_BUTTON_SELECTORS = BookingComponent.BOOKING_BUTTON_SELECTORS
+    BOOKING_FORM_SELECTORS = BookingComponent.BOOKING_FORM_SELECTORS
+
+    # Computes dates only, shared with the sync component
+    get_future_dates = BookingComponent.get_future_dates
+
+    async def wait_for_rooms_to_load(self, page):
+        """Wait for room elements to load on the page"""
+        selector = ', '.join(self.ROOMS_LOADING_SELECTORS)
+        with timeouts.measure(
+                f"ui:{selector}", UIConstants.TIMEOUT_ELEMENTS,
+                timeout_errors=PlaywrightTimeoutError
+        ) as wait:
+            await page.wait_for_selector(selector, timeout=wait.timeout)
+
+    async def find_booking_form_elements(self, page):
+        """Find booking form elements on the page, looking up all fields at once"""
+        fields = list(self.BOOKING_FORM_SELECTORS)
+        elements = await asyncio.gather(*(
+            AsyncHomePage.find_element_by_selectors(
+                page, self.BOOKING_FORM_SELECTORS[field]
+            )
+            for field in fields
+        ))
+        return {
+            field: element
+            for field, element in zip(fields, elements)
+            if element
+        }
+
+    async def fill_booking_form(self, page, booking_data):
+        """Fill the booking form with provided data"""
+        dates = self.get_future_dates()
+        elements = await self.find_booking_form_elements(page)
+        values = {
+            **{field: booking_data[field]
+               for field in ("firstname", "lastname", "email", "phone")},
+            "checkin": dates["checkin"],
+            "checkout": dates["checkout"]
+        }
+        for field, element in elements.items():
+            if field in values:
+                await element.fill(values[field])
+        return dates, elements
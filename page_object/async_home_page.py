@@ -0,0 +1,85 @@
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from page_object.base_page import BasePage
+from page_object.home_page import HomePage
+from page_object.page_state import PROBE_SCRIPT, PageState, probe_arguments
+from utils.adaptive_timeouts import timeouts
+from utils.constants_ui import UIConstants
+
+
+class AsyncHomePage(BasePage):
+    """Async counterparts of the HomePage helpers for the async Playwright API"""
+
+    BOOKING_ELEMENTS_SELECTORS = HomePage.BOOKING_ELEMENTS_SELECTORS
+
+    @staticmethod
+    async def wait_until_visible(locator, group, timeout=None):
+        """
+        Waits for the locator to become visible and records how long it took.
+        Returns False if the element does not appear within the timeout
+        (not recorded, see HomePage.wait_until_visible).
+        """
+        try:
+            with timeouts.measure(
+                    f"ui:{group}", UIConstants.TIMEOUT_RESPONSE, timeout, censor=False
+            ) as wait:
+                await locator.wait_for(state="visible", timeout=wait.timeout)
+        except PlaywrightTimeoutError:
+            return False
+        return True
+
+    @staticmethod
+    async def probe_state(page, until=None, timeout=None):
+        """Collects the page state in a single evaluation, see HomePage.probe_state"""
+        if until is not None and timeout is None:
+            timeout = timeouts.get(f"ui:probe:{until}", UIConstants.TIMEOUT_RESPONSE)
+        state = PageState(
+            await page.evaluate(PROBE_SCRIPT, probe_arguments(until, timeout or 0))
+        )
+        if until is not None:
+            timeouts.record(f"ui:probe:{until}", state.waited_ms, timed_out=not state.settled)
+        return state
+
+    @staticmethod
+    async def check_indicators(page):
+        """Method to check for both success and error indicators on the page"""
+        all_selectors = (
+            BasePage.SUCCESS_INDICATORS_SELECTORS
+            + BasePage.ERROR_INDICATORS_SELECTORS
+        )
+        combined_selector = ", ".join(all_selectors)
+        return await page.locator(combined_selector).first.is_visible()
+
+    @staticmethod
+    async def check_content_keywords(page, keywords):
+        """Checking for keywords in the page content"""
+        page_content = (await page.content()).lower()
+        return any(keyword in page_content for keyword in keywords)
+
+    @staticmethod
+    async def count_booking_elements(page, timeout=None):
+        """Counts the number of booking elements on the page"""
+        combined_selector = ", ".join(BasePage.BOOKING_ELEMENTS_SELECTORS)
+        locator = page.locator(combined_selector)
+        if await AsyncHomePage.wait_until_visible(
+                locator.first, combined_selector, timeout
+        ):
+            return await locator.count()
+        return 0
+
+    @staticmethod
+    async def click_element(page, selectors, timeout=None):
+        combined_selector = ", ".join(selectors)
+        locator = page.locator(combined_selector).first
+        if await AsyncHomePage.wait_until_visible(locator, combined_selector, timeout):
+            await locator.click()
+            return True
+        return False
+
+    @staticmethod
+    async def find_element_by_selectors(page, selectors, timeout=None):
+        combined_selector = ", ".join(selectors)
+        locator = page.locator(combined_selector).first
+        if await AsyncHomePage.wait_until_visible(locator, combined_selector, timeout):
+            return locator
+        return None
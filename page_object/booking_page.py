@@ -1,23 +1,14 @@
 from datetime import datetime, timedelta
 
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
 from page_object.base_page import BasePage
+from page_object.calendar import CalendarDriver
+from utils.adaptive_timeouts import timeouts
 from utils.constants_ui import UIConstants
 
 
 class BookingComponent(BasePage):
-    # Calendar date selectors
-    CALENDAR_DATE_SELECTORS = [
-        'button:has-text("{day}")',
-        '.day:has-text("{day}")',
-        '[data-date*="{date}"]'
-    ]
-
-    # Selectors for unavailable dates in the calendar
-    UNAVAILABLE_DATE_SELECTORS = [
-        'button:has-text("{day}")[disabled]',
-        '.disabled:has-text("{day}")',
-        '.unavailable:has-text("{day}")'
-    ]
     # Bocking button selectors
     BOOKING_BUTTON_SELECTORS = [
         'button:has-text("Book")',
@@ -75,7 +66,11 @@ class BookingComponent(BasePage):
     def wait_for_rooms_to_load(self, page):
         """Wait for room elements to load on the page"""
         selector = ', '.join(self.ROOMS_LOADING_SELECTORS)
-        page.wait_for_selector(selector, timeout=UIConstants.TIMEOUT_ELEMENTS)
+        with timeouts.measure(
+                f"ui:{selector}", UIConstants.TIMEOUT_ELEMENTS,
+                timeout_errors=PlaywrightTimeoutError
+        ) as wait:
+            page.wait_for_selector(selector, timeout=wait.timeout)
 
     def get_future_dates(self, days_from_now=None, checkout_days_later=None):
         """Method to get future check-in and check-out dates"""
@@ -127,26 +122,11 @@ class BookingComponent(BasePage):
         return dates, elements
 
     @staticmethod
-    def format_date_selector(template, day=None, date=None):
-        """Creates a formatted date selector string"""
-        if day:
-            return template.format(day=day)
-        if date:
-            return template.format(date=date)
-        return template
+    def select_stay(page, checkin, checkout):
+        """Selects the stay on the calendar by exact cells, returns the first and last selected cells"""
+        return CalendarDriver.select_range(page, checkin, checkout)
 
     @staticmethod
-    def get_calendar_selectors(day):
-        """Returns a list of calendar date selectors with a specific day"""
-        return [
-            BookingComponent.format_date_selector(selector, day=day)
-            for selector in BookingComponent.CALENDAR_DATE_SELECTORS
-        ]
-
-    @staticmethod
-    def get_unavailable_date_selectors(day):
-        """Returns a list of unavailable date selectors with a specific day"""
-        return [
-            BookingComponent.format_date_selector(selector, day=day)
-            for selector in BookingComponent.UNAVAILABLE_DATE_SELECTORS
-        ]
+    def get_unavailable_days(page, year, month):
+        """Returns the days of a month the calendar shows as unavailable"""
+        return CalendarDriver.unavailable_days(page, year, month)
@@ -0,0 +1,265 @@
+from datetime import date, datetime
+
+from utils.constants_ui import UIConstants
+
+# Reads the rendered month grid in one evaluation. The calendar root is
+# picked first (the first kind in order that is rendered, or the given
+# kind) and its header and cells are read inside it, so a second calendar
+# on the page never mixes into the grid. When a month label is expected
+# (after navigation), polls inside the page until it is shown.
+READ_MONTH_SCRIPT = """
+async ({calendars, kind, expected, timeout}) => {
+    const pick = () => {
+        for (const name of kind ? [kind] : Object.keys(calendars)) {
+            const root = document.querySelector(calendars[name].root);
+            if (root) {
+                return {name: name, root: root, selectors: calendars[name]};
+            }
+        }
+        return null;
+    };
+    const labelOf = calendar => {
+        const label = calendar ? calendar.root.querySelector(calendar.selectors.header) : null;
+        return label ? label.textContent.trim() : null;
+    };
+    const started = performance.now();
+    while (expected && labelOf(pick()) !== expected && performance.now() - started < timeout) {
+        await new Promise(resolve => setTimeout(resolve, 50));
+    }
+    const calendar = pick();
+    if (!calendar) {
+        return {label: null, kind: null, cells: []};
+    }
+    const selectors = calendar.selectors;
+    const cells = [...calendar.root.querySelectorAll(selectors.cells)];
+    const grid = cells.length ? cells[0].closest(selectors.rows) : null;
+    if (grid && grid.parentElement) {
+        grid.parentElement.scrollIntoView({block: 'center'});
+    }
+    const covered = (cell, rect) => {
+        const row = cell.closest(selectors.rows);
+        return !!row && !!selectors.markers && [...row.querySelectorAll(selectors.markers)].some(marker => {
+            const markerRect = marker.getBoundingClientRect();
+            return markerRect.left < rect.right - 1 && markerRect.right > rect.left + 1;
+        });
+    };
+    return {
+        label: labelOf(calendar),
+        kind: calendar.name,
+        cells: cells.map((cell, index) => {
+            const rect = cell.getBoundingClientRect();
+            return {
+                index: index,
+                day: parseInt(cell.textContent.trim(), 10),
+                in_month: !cell.matches(selectors.off_range),
+                unavailable: cell.matches(selectors.disabled) || covered(cell, rect),
+                x: rect.left + rect.width / 2,
+                y: rect.top + rect.height / 2
+            };
+        }).filter(cell => !isNaN(cell.day))
+    };
+}
+"""
+
+
+class CalendarCell:
+    """A day cell of the rendered month grid"""
+
+    __slots__ = ("index", "day", "in_month", "unavailable", "x", "y")
+
+    def __init__(self, index, day, in_month, unavailable, x, y):
+        self.index = index
+        self.day = day
+        self.in_month = in_month
+        self.unavailable = unavailable
+        self.x = x
+        self.y = y
+
+    def __repr__(self):
+        return f"CalendarCell({self.day}, in_month={self.in_month})"
+
+
+class CalendarMonth:
+    """
+    The month shown by the calendar with all cells of its grid.
+    Raises AssertionError when no calendar is shown or its month label
+    is missing or not in one of LABEL_FORMATS.
+    """
+
+    LABEL_FORMAT = "%B %Y"
+    LABEL_FORMATS = (LABEL_FORMAT, "%b %Y")
+
+    def __init__(self, label, cells, kind=None):
+        if not cells and not label:
+            raise AssertionError("No calendar is shown")
+        self.label = label
+        self.kind = kind
+        self.cells = [CalendarCell(**cell) for cell in cells]
+        shown = self.parse_label(label)
+        self.year, self.month = shown.year, shown.month
+
+    @classmethod
+    def parse_label(cls, label):
+        """Month of a label like 'October 2026'"""
+        if not label:
+            raise AssertionError("Calendar shows no month label")
+        for label_format in cls.LABEL_FORMATS:
+            try:
+                return datetime.strptime(label.strip(), label_format)
+            except ValueError:
+                pass
+        raise AssertionError(
+            f"Unrecognized calendar month label {label!r}, "
+            f"expected a format of {cls.LABEL_FORMATS}"
+        )
+
+    def steps_to(self, target):
+        """Number of 'next' (positive) or 'back' (negative) clicks to reach target's month"""
+        return (target.year - self.year) * 12 + target.month - self.month
+
+    def cell_for(self, target):
+        """
+        Exact cell of a date: a day of the shown month, or an off-range day
+        of the previous or next month shown before or after it.
+        """
+        steps = self.steps_to(target)
+        if steps == 0:
+            candidates = [cell for cell in self.cells if cell.in_month]
+        elif abs(steps) == 1:
+            first_in_month = next(
+                (cell.index for cell in self.cells if cell.in_month), 0
+            )
+            candidates = [
+                cell for cell in self.cells
+                if not cell.in_month and (cell.index > first_in_month) == (steps > 0)
+            ]
+        else:
+            candidates = []
+        return next((cell for cell in candidates if cell.day == target.day), None)
+
+    def unavailable_days(self):
+        return sorted(cell.day for cell in self.cells if cell.in_month and cell.unavailable)
+
+
+class CalendarDriver:
+    """
+    Date selection on the month grid calendar (react-big-calendar or
+    react-datepicker). The grid is read in one evaluation, the target
+    month is reached by a computed number of navigation clicks and dates
+    are selected by their exact cells.
+    """
+
+    # Selectors of each supported calendar, relative to its root. The big
+    # calendar of the room comes first: the datepicker is a popup of the
+    # check-in field that may be shown next to it.
+    CALENDARS = {
+        "big_calendar": {
+            "root": ".rbc-calendar",
+            "header": ".rbc-toolbar-label",
+            "cells": ".rbc-month-view .rbc-date-cell",
+            "rows": ".rbc-month-row",
+            "off_range": ".rbc-off-range",
+            "disabled": "[aria-disabled=\"true\"], .disabled, .unavailable",
+            "markers": ".rbc-event",
+            "next": '.rbc-toolbar button:has-text("Next")',
+            "previous": '.rbc-toolbar button:has-text("Back")'
+        },
+        "datepicker": {
+            "root": ".react-datepicker",
+            "header": ".react-datepicker__current-month",
+            "cells": ".react-datepicker__day",
+            "rows": ".react-datepicker__week",
+            "off_range": ".react-datepicker__day--outside-month",
+            "disabled": (
+                ".react-datepicker__day--disabled, [aria-disabled=\"true\"], "
+                ".disabled, .unavailable"
+            ),
+            "markers": None,
+            "next": ".react-datepicker__navigation--next",
+            "previous": ".react-datepicker__navigation--previous"
+        }
+    }
+
+    @staticmethod
+    def root(page, kind):
+        """Locator of the calendar of the kind, the one read by read_month"""
+        return page.locator(CalendarDriver.CALENDARS[kind]["root"]).first
+
+    @staticmethod
+    def read_month(page, expected=None, timeout=UIConstants.TIMEOUT_CALENDAR, kind=None):
+        """
+        Returns the shown CalendarMonth of the calendar of the kind (by
+        default the first rendered one of CALENDARS), waiting for the
+        expected label if given.
+        """
+        snapshot = page.evaluate(READ_MONTH_SCRIPT, {
+            "calendars": CalendarDriver.CALENDARS,
+            "kind": kind,
+            "expected": expected,
+            "timeout": timeout
+        })
+        return CalendarMonth(snapshot["label"], snapshot["cells"], snapshot["kind"])
+
+    @staticmethod
+    def go_to_month(page, target, kind=None):
+        """Navigates the calendar to the month of the target date and returns it"""
+        month = CalendarDriver.read_month(page, kind=kind)
+        steps = month.steps_to(target)
+        if steps == 0:
+            return month
+        button = CalendarDriver.root(page, month.kind).locator(
+            CalendarDriver.CALENDARS[month.kind]["next" if steps > 0 else "previous"]
+        ).first
+        for _ in range(abs(steps)):
+            button.click()
+        expected = date(target.year, target.month, 1).strftime(CalendarMonth.LABEL_FORMAT)
+        month = CalendarDriver.read_month(page, expected, kind=month.kind)
+        if month.steps_to(target) != 0:
+            raise AssertionError(f"Calendar shows {month.label}, expected {expected}")
+        return month
+
+    @staticmethod
+    def select_date(page, target, kind=None):
+        """Clicks the exact cell of the target date"""
+        month = CalendarDriver.go_to_month(page, target, kind)
+        cell = month.cell_for(target)
+        if cell is None:
+            raise AssertionError(f"No calendar cell for {target} in {month.label}")
+        CalendarDriver.root(page, month.kind).locator(
+            CalendarDriver.CALENDARS[month.kind]["cells"]
+        ).nth(cell.index).click()
+        return cell
+
+    @staticmethod
+    def select_range(page, checkin, checkout):
+        """
+        Selects the stay from check-in to check-out and returns the first
+        and last selected cells. react-big-calendar selects the nights by
+        dragging from the check-in cell to the cell of the last night;
+        react-datepicker selects a range by clicking the check-in and
+        check-out dates.
+        """
+        month = CalendarDriver.go_to_month(page, checkin)
+        if month.kind == "datepicker":
+            return (
+                CalendarDriver.select_date(page, checkin, month.kind),
+                CalendarDriver.select_date(page, checkout, month.kind)
+            )
+        if month.kind != "big_calendar":
+            raise AssertionError(f"Range selection is not supported by calendar {month.kind}")
+        last_night = date.fromordinal(checkout.toordinal() - 1)
+        first, last = month.cell_for(checkin), month.cell_for(last_night)
+        if first is None or last is None:
+            raise AssertionError(
+                f"Stay {checkin} - {checkout} is not on the grid of {month.label}"
+            )
+        page.mouse.move(first.x, first.y)
+        page.mouse.down()
+        page.mouse.move(last.x, last.y, steps=5)
+        page.mouse.up()
+        return first, last
+
+    @staticmethod
+    def unavailable_days(page, year, month):
+        """Days of a month shown as unavailable (disabled or covered by a booking)"""
+        return CalendarDriver.go_to_month(page, date(year, month, 1)).unavailable_days()
@@ -1,4 +1,8 @@
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
 from page_object.base_page import BasePage
+from page_object.page_state import PROBE_SCRIPT, PageState, probe_arguments
+from utils.adaptive_timeouts import timeouts
 from utils.constants_ui import UIConstants
 
 
@@ -13,6 +17,39 @@ class HomePage(BasePage):
         'button:has-text("Book"), input[value*="Book"]'
     ]
 
+    @staticmethod
+    def wait_until_visible(locator, group, timeout=None):
+        """
+        Waits for the locator to become visible and records how long it took.
+        The timeout is learned from previous waits of the same selector group.
+        Returns False instead of throwing an exception if the element
+        does not appear within the timeout; such waits are not recorded,
+        since an absent element is an answer, not a slow one.
+        """
+        try:
+            with timeouts.measure(
+                    f"ui:{group}", UIConstants.TIMEOUT_RESPONSE, timeout, censor=False
+            ) as wait:
+                locator.wait_for(state="visible", timeout=wait.timeout)
+        except PlaywrightTimeoutError:
+            return False
+        return True
+
+    @staticmethod
+    def probe_state(page, until=None, timeout=None):
+        """
+        Collects the visible indicators, validation messages and form
+        counts of the page in a single evaluation and returns a PageState.
+        With until="indicator" or until="booking_elements" the probe polls
+        inside the page until the condition holds or the timeout passes.
+        """
+        if until is not None and timeout is None:
+            timeout = timeouts.get(f"ui:probe:{until}", UIConstants.TIMEOUT_RESPONSE)
+        state = PageState(page.evaluate(PROBE_SCRIPT, probe_arguments(until, timeout or 0)))
+        if until is not None:
+            timeouts.record(f"ui:probe:{until}", state.waited_ms, timed_out=not state.settled)
+        return state
+
     @staticmethod
     def check_indicators(page):
         """Method to check for both success and error indicators on the page"""
@@ -32,7 +69,7 @@ class HomePage(BasePage):
         return check_result
 
     @staticmethod
-    def count_booking_elements(page, timeout=UIConstants.TIMEOUT_RESPONSE):
+    def count_booking_elements(page, timeout=None):
         """
         Counts the number of booking elements on the page.
         """
@@ -41,30 +78,26 @@ class HomePage(BasePage):
 
         # Wait for at least one element to be visible within the timeout.
         # If none become visible, return 0 instead of throwing an exception.
-        if locator.first.is_visible(timeout=timeout):
+        if HomePage.wait_until_visible(locator.first, combined_selector, timeout):
             return locator.count()
         return 0
 
     @staticmethod
-    def click_element(page, selectors, timeout=UIConstants.TIMEOUT_RESPONSE):
+    def click_element(page, selectors, timeout=None):
         combined_selector = ", ".join(selectors)
         locator = page.locator(combined_selector).first
 
-        # is_visible returns False if the element does not appear within the timeout
-        if locator.is_visible(timeout=timeout):
+        # Returns False if the element does not appear within the timeout
+        if HomePage.wait_until_visible(locator, combined_selector, timeout):
             locator.click()
             return True
         return False
 
     @staticmethod
-    def find_element_by_selectors(
-            page,
-            selectors,
-            timeout=UIConstants.TIMEOUT_RESPONSE
-    ):
+    def find_element_by_selectors(page, selectors, timeout=None):
         combined_selector = ", ".join(selectors)
         locator = page.locator(combined_selector).first
         # Wait for the element to be visible within the timeout.
-        if locator.is_visible(timeout=timeout):
+        if HomePage.wait_until_visible(locator, combined_selector, timeout):
             return locator
         return None
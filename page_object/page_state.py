@@ -0,0 +1,171 @@
+import re
+
+from page_object.base_page import BasePage
+from utils.constants_ui import UIConstants
+
+_TEXT_SELECTOR = re.compile(r'^text="(?P<text>.*)"$')
+_HAS_TEXT_SELECTOR = re.compile(r'^(?P<css>.*):has-text\("(?P<text>.*)"\)$')
+
+
+def split_selector_list(selector):
+    """Split a selector list on top-level commas (not inside quotes or brackets)"""
+    parts, current, depth, quote = [], [], 0, None
+    for char in selector:
+        if quote:
+            quote = None if char == quote else quote
+        elif char in "\"'":
+            quote = char
+        elif char in "[(":
+            depth += 1
+        elif char in "])":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append("".join(current).strip())
+            current = []
+            continue
+        current.append(char)
+    parts.append("".join(current).strip())
+    return [part for part in parts if part]
+
+
+def selector_specs(selectors):
+    """
+    Translate Playwright selectors into specs the probe script understands:
+    CSS, text="..." (exact text) and css:has-text("...") (contained text).
+    """
+    specs = []
+    for selector in selectors:
+        for part in split_selector_list(selector):
+            text_match = _TEXT_SELECTOR.match(part)
+            has_text_match = _HAS_TEXT_SELECTOR.match(part)
+            if text_match:
+                spec = {"css": None, "text": text_match["text"], "exact": True}
+            elif has_text_match:
+                spec = {"css": has_text_match["css"], "text": has_text_match["text"],
+                        "exact": False}
+            else:
+                spec = {"css": part, "text": None, "exact": False}
+            specs.append({"selector": selector, **spec})
+    return specs
+
+
+# Collects the whole post-submit state in one evaluation. When `until` names
+# a condition, polls inside the page until it holds or the timeout passes.
+PROBE_SCRIPT = """
+async ({groups, keywords, until, timeout}) => {
+    const visible = el => {
+        const rect = el.getBoundingClientRect();
+        const style = getComputedStyle(el);
+        return rect.width > 0 && rect.height > 0
+            && style.visibility !== 'hidden' && style.display !== 'none';
+    };
+    const textOf = el => (el.innerText || el.textContent || '').trim();
+    const find = spec => {
+        let elements = [...document.querySelectorAll(spec.css || 'body *')];
+        if (spec.text !== null) {
+            const wanted = spec.text.toLowerCase();
+            elements = elements.filter(el => spec.exact
+                ? textOf(el) === spec.text
+                : textOf(el).toLowerCase().includes(wanted));
+        }
+        return elements.filter(visible);
+    };
+    const collect = specs => specs.flatMap(spec => find(spec).slice(0, 5).map(
+        el => ({selector: spec.selector, text: textOf(el).slice(0, 200)})));
+    const count = specs => new Set(specs.flatMap(find)).size;
+    const snapshot = () => {
+        const html = document.documentElement.outerHTML.toLowerCase();
+        const fields = [...document.querySelectorAll('input, textarea, select')];
+        return {
+            success: collect(groups.success),
+            errors: collect(groups.errors),
+            validation: fields
+                .filter(el => el.validationMessage
+                    || el.getAttribute('aria-invalid') === 'true'
+                    || el.classList.contains('is-invalid'))
+                .map(el => ({
+                    field: el.name || el.id || el.placeholder || el.type,
+                    message: el.validationMessage
+                })),
+            forms: document.forms.length,
+            booking_elements: count(groups.booking),
+            firstname_inputs: document.querySelectorAll(
+                'input[placeholder*="Firstname"]').length,
+            success_keywords: keywords.success.filter(k => html.includes(k)),
+            error_keywords: keywords.errors.filter(k => html.includes(k)),
+            content_length: html.length
+        };
+    };
+    const holds = state => ({
+        indicator: state.success.length + state.errors.length > 0,
+        booking_elements: state.booking_elements > 0
+    })[until];
+    const started = performance.now();
+    let state = snapshot();
+    while (until && !holds(state) && performance.now() - started < timeout) {
+        await new Promise(resolve => setTimeout(resolve, 100));
+        state = snapshot();
+    }
+    state.settled = !until || holds(state);
+    state.waited_ms = performance.now() - started;
+    return state;
+}
+"""
+
+
+def probe_arguments(until=None, timeout=0):
+    """Argument of PROBE_SCRIPT for the BasePage selector groups"""
+    return {
+        "groups": {
+            "success": selector_specs(BasePage.SUCCESS_INDICATORS_SELECTORS),
+            "errors": selector_specs(BasePage.ERROR_INDICATORS_SELECTORS),
+            "booking": selector_specs(BasePage.BOOKING_ELEMENTS_SELECTORS)
+        },
+        "keywords": {
+            "success": UIConstants.SUCCESS_KEYWORDS,
+            "errors": UIConstants.ERROR_KEYWORDS
+        },
+        "until": until,
+        "timeout": timeout
+    }
+
+
+class PageState:
+    """Snapshot of the indicators, validation messages and form of a page"""
+
+    __slots__ = (
+        "success", "errors", "validation", "forms", "booking_elements",
+        "firstname_inputs", "success_keywords", "error_keywords",
+        "content_length", "settled", "waited_ms"
+    )
+
+    def __init__(self, snapshot):
+        for name in self.__slots__:
+            setattr(self, name, snapshot[name])
+
+    @property
+    def success_visible(self):
+        return bool(self.success)
+
+    @property
+    def error_visible(self):
+        return bool(self.errors)
+
+    @property
+    def indicator_visible(self):
+        """Any success or error indicator is visible"""
+        return self.success_visible or self.error_visible
+
+    def texts(self):
+        """Texts of the visible indicators and validation messages"""
+        return (
+            [match["text"] for match in self.success + self.errors]
+            + [field["message"] for field in self.validation if field["message"]]
+        )
+
+    def __repr__(self):
+        return (
+            f"PageState(success={len(self.success)}, errors={len(self.errors)}, "
+            f"validation={len(self.validation)}, forms={self.forms}, "
+            f"booking_elements={self.booking_elements})"
+        )
@@ -1,12 +1,224 @@
+import os
 import sys
+import uuid
 
 import pytest
-import requests
 from loguru import logger
 
 from page_object.booking_page import BookingComponent
 from page_object.home_page import HomePage
+from utils.adaptive_timeouts import timeouts
+from utils.browser_server import (
+    ENDPOINTS_ENV,
+    BrowserServerPool,
+    SharedBrowserConnection,
+    shared_browser_endpoint
+)
+from utils.constants_ui import UIConstants
+from utils.lazy_dataset import parametrize_from_dataset
+from utils.rate_limiter import rate_limiter
+from utils.structured_logging import BackgroundJsonSink, api_log
+from utils.transports import TRANSPORTS
 from utils.utils_api import BookingUtils
+from utils.warm_up import SessionWarmUp
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--transport",
+        action="store",
+        default=None,
+        choices=sorted(TRANSPORTS),
+        help="HTTP transport for BookingUtils (default: requests)"
+    )
+    parser.addoption(
+        "--profile-tests",
+        action="store_true",
+        default=False,
+        help="Sample the CPU stacks of every test and write flamegraphs"
+    )
+    parser.addoption(
+        "--profile-dir",
+        action="store",
+        default="profiles",
+        help="Directory for per-test collapsed stacks and the session flamegraph"
+    )
+    parser.addoption(
+        "--profile-interval",
+        action="store",
+        type=float,
+        default=0.005,
+        help="Sampling interval of the test profiler in seconds"
+    )
+    parser.addoption(
+        "--memory-track",
+        action="store_true",
+        default=False,
+        help="Snapshot Python allocations and RSS around every test"
+    )
+    parser.addoption(
+        "--memory-threshold-kb",
+        action="store",
+        type=int,
+        default=1024,
+        help="Flag tests retaining more memory than this (KiB)"
+    )
+    parser.addoption(
+        "--memory-top",
+        action="store",
+        type=int,
+        default=10,
+        help="Number of top growing allocation sites to report"
+    )
+    parser.addoption(
+        "--memory-report",
+        action="store",
+        default="memory_report.json",
+        help="Path of the JSON memory report"
+    )
+    parser.addoption(
+        "--shared-browser-servers",
+        action="store",
+        type=int,
+        default=0,
+        help="Start this many shared browser servers for all xdist workers"
+    )
+    parser.addoption(
+        "--dataset-tags",
+        action="store",
+        default="",
+        help="Comma separated tags selecting cases of @pytest.mark.dataset tests"
+    )
+    parser.addoption(
+        "--schedule-by-duration",
+        action="store_true",
+        default=False,
+        help="Record test durations and run the longest tests first under xdist"
+    )
+    parser.addoption(
+        "--durations-file",
+        action="store",
+        default=".test_durations.json",
+        help="Path of the recorded test durations"
+    )
+    parser.addoption(
+        "--trace-on-failure",
+        action="store_true",
+        default=False,
+        help="Keep the Playwright trace of failed UI tests only "
+             "(pytest-playwright --tracing retain-on-failure)"
+    )
+    parser.addoption(
+        "--log-sampling",
+        action="store",
+        default="",
+        help="Per-level sampling of structured API log events, e.g. DEBUG=0.01,INFO=0.5"
+    )
+    parser.addoption(
+        "--result-cache",
+        action="store_true",
+        default=False,
+        help="Skip tests that passed before when their sources, data and environment are unchanged"
+    )
+    parser.addoption(
+        "--force-rerun",
+        action="store_true",
+        default=False,
+        help="Run all tests with --result-cache, still recording the passes"
+    )
+    parser.addoption(
+        "--result-cache-file",
+        action="store",
+        default=".test_results_cache.json",
+        help="Path of the result cache"
+    )
+
+
+def pytest_generate_tests(metafunc):
+    tags = [tag for tag in metafunc.config.getoption("dataset_tags").split(",") if tag]
+    parametrize_from_dataset(metafunc, metafunc.config.rootpath, tags)
+
+
+def pytest_configure(config):
+    try:
+        api_log.configure(api_log.parse_sampling(config.getoption("log_sampling")))
+    except ValueError as e:
+        raise pytest.UsageError(f"--log-sampling: {e}")
+    servers = config.getoption("shared_browser_servers")
+    if (servers and not hasattr(config, "workerinput")
+            and not os.environ.get(ENDPOINTS_ENV)):
+        # Workers are spawned after configure and inherit the endpoints
+        config.browser_server_pool = BrowserServerPool(servers)
+        config.browser_server_pool.start()
+        os.environ[ENDPOINTS_ENV] = ",".join(config.browser_server_pool.endpoints)
+    if config.getoption("profile_tests"):
+        from utils.profiling import ProfilingPlugin
+        config.pluginmanager.register(
+            ProfilingPlugin(
+                config,
+                config.getoption("profile_dir"),
+                config.getoption("profile_interval")
+            ),
+            "test-profiling"
+        )
+    if config.getoption("memory_track"):
+        from utils.memory_tracking import MemoryTrackingPlugin
+        config.pluginmanager.register(
+            MemoryTrackingPlugin(
+                config,
+                config.getoption("memory_threshold_kb"),
+                config.getoption("memory_top"),
+                config.getoption("memory_report")
+            ),
+            "memory-tracking"
+        )
+    if config.getoption("schedule_by_duration"):
+        from utils.duration_scheduler import DurationSchedulingPlugin
+        config.pluginmanager.register(
+            DurationSchedulingPlugin(config, config.getoption("durations_file")),
+            "duration-scheduling"
+        )
+    if config.getoption("result_cache"):
+        from utils.result_cache import (
+            ENVIRONMENT_ENV,
+            ResultCachePlugin,
+            environment_fingerprint
+        )
+        result_cache = ResultCachePlugin(
+            config,
+            config.getoption("result_cache_file"),
+            config.getoption("force_rerun")
+        )
+        if not hasattr(config, "workerinput") and ENVIRONMENT_ENV not in os.environ:
+            # Workers are spawned after configure and inherit the fingerprint
+            booking_utils = BookingUtils(transport=config.getoption("transport"))
+            result_cache.set_environment(environment_fingerprint(booking_utils))
+            booking_utils.transport.close()
+        config.pluginmanager.register(result_cache, "result-cache")
+    # pytest-playwright traces every context and keeps the trace when the
+    # test failed, also in setup (written to --output, test-results/ by default)
+    if config.getoption("trace_on_failure"):
+        from utils.tracing_overhead import TracingOverheadPlugin
+        config.pluginmanager.register(TracingOverheadPlugin(config), "tracing-overhead")
+
+
+def pytest_unconfigure(config):
+    pool = getattr(config, "browser_server_pool", None)
+    if pool is not None:
+        pool.stop()
+        os.environ.pop(ENDPOINTS_ENV, None)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """
+    Store the wait durations observed in this run for adaptive timeouts
+    and report how long API calls waited for the shared rate limiter.
+    """
+    timeouts.save()
+    for endpoint_class, stats in rate_limiter.stats().items():
+        logger.info(f"Rate limiter [{endpoint_class}]: {stats}")
+    for level, stats in api_log.stats().items():
+        logger.info(f"Structured log [{level}]: {stats}")
 
 
 # Logger Setup
@@ -22,18 +234,43 @@ def setup_logging():
         colorize=True
     )
     log_file_path = "test_result_{time:YYYYMMDD}.log"
+    info_level = logger.level("INFO").no
     logger.add(
         log_file_path,
         level="DEBUG",
-        rotation="3 MB",
+        # Debug API events go to the structured log only
+        filter=lambda record: (
+            "event" not in record["extra"] or record["level"].no >= info_level
+        ),
+        rotation=UIConstants.LOG_ROTATION,
+        retention=UIConstants.LOG_RETENTION,
         compression="zip",
         enqueue=True,
         catch=True
     )
+    # Structured API events as JSON lines, written by a background thread
+    # One file per xdist worker, so workers never rotate each other's files
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    api_log_sink = BackgroundJsonSink(
+        UIConstants.API_LOG_FILE.replace(".jsonl", f"_{worker}.jsonl")
+        if worker else UIConstants.API_LOG_FILE,
+        UIConstants.API_LOG_MAX_BYTES,
+        UIConstants.LOG_RETENTION
+    )
+    api_log_handler = logger.add(
+        api_log_sink,
+        level="DEBUG",
+        filter=lambda record: "event" in record["extra"],
+        catch=True
+    )
     logger.info("Logger configuration complete.")
     yield
     logger.info("Test session finished. Closing logs.")
     logger.complete()
+    logger.remove(api_log_handler)
+    api_log_sink.close()
+    if api_log_sink.dropped:
+        logger.warning(f"Structured log dropped {api_log_sink.dropped} events")
 
 
 # Context Class for UI Tests
@@ -54,14 +291,38 @@ def booking_page(page):
 
 
 @pytest.fixture(scope="session")
-def utils():
-    return BookingUtils()
+def utils(pytestconfig):
+    booking_utils = BookingUtils(transport=pytestconfig.getoption("transport"))
+    yield booking_utils
+    booking_utils.transport.close()
+
+
+# Warm-up Fixture
+@pytest.fixture(scope="session")
+def warm_up(utils):
+    """
+    Opens pooled API connections and obtains the admin token in the
+    background while the first test starts (and launches the browser).
+    Requested by the browser and admin_headers fixtures only, so sessions
+    without UI or admin API tests send no warm-up requests.
+    """
+    session_warm_up = SessionWarmUp(utils)
+    session_warm_up.start()
+    yield session_warm_up
+    session_warm_up.wait()
+
+
+# Dataset Case Fixture
+@pytest.fixture
+def case(request):
+    """Payload of a dataset case, loaded only when the test runs"""
+    return request.param.load()
 
 
 # Admin Headers Fixture
 @pytest.fixture(scope="session")
-def admin_headers(utils):
-    token = utils.get_admin_auth_token()
+def admin_headers(utils, warm_up):
+    token = utils.get_cached_admin_token()
     assert token is not None, "Failed to retrieve admin token for fixture"
     return {
         "Content-Type": "application/json",
@@ -70,6 +331,19 @@ def admin_headers(utils):
     }
 
 
+# Room for Data-Driven Booking Tests
+@pytest.fixture(scope="module")
+def booking_room_id(utils, admin_headers):
+    """Creates a room for bookings of dataset cases and deletes it afterwards"""
+    room_name = f"Test Dataset Room {uuid.uuid4().hex[:8]}"
+    room_data = {**utils.test_data["room_data"], "roomName": room_name}
+    utils.create_room(utils.room_api_base, room_data, admin_headers)
+    room = next(utils.iter_rooms(name_prefix=room_name), None)
+    assert room is not None, "Room for dataset cases not found"
+    yield room.room_id
+    utils.delete_room(utils.room_api_base, room.room_id, admin_headers)
+
+
 # Browser Configuration Fixtures
 @pytest.fixture(scope="session")
 def browser_type_launch_args(browser_type_launch_args):
@@ -85,6 +359,28 @@ def browser_type_launch_args(browser_type_launch_args):
     }
 
 
+# Browser Fixture
+@pytest.fixture(scope="session")
+def browser(launch_browser, browser_type, warm_up, request):
+    """
+    Launches the browser, or connects to a shared browser server when
+    SHARED_BROWSER_ENDPOINTS is set, during warm-up.
+    """
+    # Also without xdist (-p no:xdist), where the worker_id fixture does not exist
+    worker_id = getattr(request.config, "workerinput", {}).get("workerid", "master")
+    endpoint = shared_browser_endpoint(worker_id)
+    if endpoint:
+        browser = warm_up.run(
+            "browser_connect", SharedBrowserConnection, browser_type, endpoint,
+            critical=True
+        )
+    else:
+        browser = warm_up.run("browser_launch", launch_browser, critical=True)
+    warm_up.wait()
+    yield browser
+    browser.close()
+
+
 # Browser Context Fixture
 @pytest.fixture(scope="session")
 def browser_context_args(browser_context_args):
@@ -134,7 +430,7 @@ def ui_app(page, utils):
         f"UI Test Teardown: "
         f"Starting cleanup for {len(context.created_booking_ids)} bookings"
     )
-    token = utils.get_admin_auth_token()
+    token = utils.get_cached_admin_token()
 
     if token and context.created_booking_ids:
         headers = {
@@ -143,20 +439,10 @@ def ui_app(page, utils):
             "User-Agent": "pytest"
         }
         for booking_id in context.created_booking_ids:
-            try:
-                response = requests.delete(
-                    f"{api_url}/{booking_id}",
-                    headers=headers,
-                    timeout=10
-                )
-                if response.status_code in [201, 204, 200]:
-                    logger.debug(f"Successfully deleted booking {booking_id}")
-                else:
-                    logger.warning(
-                        f"Failed to delete booking {booking_id}."
-                        f" Status: {response.status_code}"
-                    )
-            except Exception as e:
-                logger.error(f"Error during cleanup of booking {booking_id}: {e}")
+            # Goes through the shared rate limiter like all other API calls
+            if utils.delete_booking(api_url, booking_id, headers):
+                logger.debug(f"Successfully deleted booking {booking_id}")
+            else:
+                logger.warning(f"Failed to delete booking {booking_id}")
 
     logger.info("UI Test Teardown: Finished")
@@ -2,6 +2,7 @@ import pytest
 
 
 @pytest.mark.api
+@pytest.mark.xdist_group("admin_api")
 class TestAdminAPI:
     """Admin API Test Suite (Refactored)"""
 
@@ -14,24 +15,22 @@ class TestAdminAPI:
         room_data = utils.test_data["room_data"]
         # Create room (Admin API)
         utils.create_room(api_base, room_data, admin_headers)
-        # Check the room is created successfully
-        rooms = utils.get_available_rooms()
-        matching_room = next(
-            (room for room in rooms if room.get("roomName") == room_data["roomName"]),
-            None
+        # Check the room is created successfully, as soon as it is listed
+        matching_room = utils.wait_until(
+            lambda: utils.get_available_rooms().first(name=room_data["roomName"]),
+            name="room created"
         )
         assert matching_room is not None, "Created room not found in room list"
 
         # Save room ID for later tests
-        TestAdminAPI.room_id = matching_room.get("roomid")
+        TestAdminAPI.room_id = matching_room.room_id
         assert TestAdminAPI.room_id is not None
 
     def test_get_all_rooms(self, utils):
         """Test retrieving all rooms (User API)"""
         rooms = utils.get_available_rooms()
         assert isinstance(rooms, list), "Rooms should be returned as a list"
-        assert any(room.get("roomid") == TestAdminAPI.room_id for room in
-                   rooms), "Created room not found"
+        assert rooms.by_id(TestAdminAPI.room_id) is not None, "Created room not found"
 
     def test_verify_created_room(self, utils):
         """Check that created room actually exists (User API)"""
@@ -53,9 +52,7 @@ class TestAdminAPI:
         """Test retrieving booking details (Admin API)"""
         booking = utils.get_booking_details(TestAdminAPI.booking_id)
         assert booking is not None, "Failed to fetch booking details"
-        assert booking.get("bookingid") == TestAdminAPI.booking_id or booking.get(
-            "id"
-        ) == TestAdminAPI.booking_id
+        assert booking.booking_id == TestAdminAPI.booking_id
 
     def test_edit_room(self, utils, admin_headers):
         """Test: Edit Room (Admin API) and check changes (User API)"""
@@ -67,16 +64,16 @@ class TestAdminAPI:
         result = utils.update_room(TestAdminAPI.room_id, updated_data, admin_headers)
         assert result is not None, "Update operation failed"
 
-        # Check the changes (User API)
-        rooms = utils.get_available_rooms()
-        updated_room = next(
-            (room for room in rooms if room["roomid"] == TestAdminAPI.room_id),
-            None
+        # Check the changes (User API), as soon as they are visible
+        updated_room = utils.wait_until(
+            lambda: utils.get_available_rooms().by_id(TestAdminAPI.room_id),
+            lambda room: room is not None and room.price == 999,
+            name="room updated"
         )
 
         assert updated_room is not None, "Room not found after update"
-        assert updated_room["roomName"] == "Updated Room Name"
-        assert updated_room["roomPrice"] == 999
+        assert updated_room.name == "Updated Room Name"
+        assert updated_room.price == 999
 
     def test_delete_booking(self, utils, admin_headers):
         """Test deleting the created booking (Admin API)"""
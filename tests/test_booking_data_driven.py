@@ -0,0 +1,66 @@
+import pytest
+
+from page_object.base_page import BasePage
+
+DATASET = "datasets/booking_cases.jsonl"
+
+
+@pytest.mark.api
+@pytest.mark.dataset(DATASET, tags=["api"])
+class TestBookingValidationAPI:
+    """Data-driven validation of the booking API"""
+
+    def test_create_booking(self, utils, admin_headers, booking_room_id, case):
+        """Booking is created for valid data and rejected for invalid data"""
+        dates = utils.get_future_dates(
+            days_from_now=case["checkin_days"],
+            checkout_days_later=1
+        )
+        payload = {
+            **case["booking"],
+            "roomid": booking_room_id,
+            "bookingdates": {
+                "checkin": dates["checkin"],
+                "checkout": dates["checkout"]
+            }
+        }
+
+        if case["expected"] == "rejected":
+            with pytest.raises(Exception, match="Failed to create booking"):
+                utils.create_booking(utils.booking_api_base, payload)
+            return
+
+        booking = utils.create_booking(utils.booking_api_base, payload)
+        booking_id = booking.booking_id
+        assert booking_id, "Booking creation failed"
+        assert utils.delete_booking(
+            utils.booking_api_base,
+            booking_id,
+            admin_headers
+        ), "Booking deletion failed"
+
+
+@pytest.mark.ui
+@pytest.mark.dataset(DATASET, tags=["ui"])
+class TestBookingFormUI:
+    """Data-driven validation of the booking form"""
+
+    def test_fill_booking_form(self, ui_app, home_page, booking_page, case):
+        """Booking form shows success or error indicators for the case data"""
+        page = ui_app.page
+        booking_page.wait_for_rooms_to_load(page)
+        home_page.click_element(page, booking_page.BOOKING_BUTTON_SELECTORS)
+
+        _, elements = booking_page.fill_booking_form(page, case["booking"])
+        if "book_button" in elements:
+            elements["book_button"].click()
+        else:
+            home_page.click_element(page, BasePage.SUBMIT_BUTTON_SELECTORS)
+
+        state = home_page.probe_state(page)
+        keywords = (
+            state.success_keywords if case["expected"] == "created"
+            else state.error_keywords
+        )
+        assert state.indicator_visible or keywords, \
+            f"Missing indicators for case {case['id']}: {state}"
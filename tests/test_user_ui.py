@@ -1,8 +1,7 @@
 import json
-from datetime import datetime
+from datetime import date, datetime, timedelta
 
 import pytest
-from loguru import logger
 
 from page_object.base_page import BasePage
 from utils.constants_ui import UIConstants
@@ -28,16 +27,10 @@ class TestUserUI:
         else:
             home_page.click_element(page, BasePage.SUBMIT_BUTTON_SELECTORS)
 
-        success_found = home_page.check_indicators(page)
-        if not success_found:
-            success_found = home_page.check_content_keywords(
-                page,
-                UIConstants.SUCCESS_KEYWORDS
-            )
+        state = home_page.probe_state(page)
+        success_found = state.indicator_visible or bool(state.success_keywords)
 
-        assert success_found or len(
-            page.locator('input[placeholder*="Firstname"]').all()
-        ) == 0
+        assert success_found or state.firstname_inputs == 0, state
 
     @pytest.mark.ui_test_2
     def test_room_booking_with_invalid_data(self, ui_app, utils, home_page,
@@ -67,13 +60,10 @@ class TestUserUI:
         else:
             home_page.click_element(page, BasePage.SUBMIT_BUTTON_SELECTORS)
 
-        error_found = home_page.check_indicators(page)
-        if not error_found:
-            error_found = home_page.check_content_keywords(
-                page,
-                UIConstants.ERROR_KEYWORDS)
+        state = home_page.probe_state(page)
+        error_found = state.indicator_visible or bool(state.error_keywords)
 
-        assert error_found, "Missing error indicators for invalid booking data"
+        assert error_found, f"Missing error indicators for invalid booking data: {state}"
 
     @pytest.mark.ui_test_3
     def test_earlier_booked_dates_show_as_unavailable(self, ui_app, home_page,
@@ -113,15 +103,14 @@ class TestUserUI:
 
         if 'checkin' in elements:
             elements['checkin'].click()
-            unavailable = page.locator('.unavailable, .disabled').filter(
-                has_text="1"
-            ).first
-            if unavailable.count() > 0:
-                assert True, "Date is marked as unavailable. Test passed."
-            else:
-                logger.info("Visually check if the date '1' is marked as unavailable.")
 
-            assert True
+        # Whole month read at once: no per-day text matching and clicking.
+        # Fails when no calendar is shown
+        unavailable = booking_page.get_unavailable_days(page, today.year, today.month)
+        booked_days = set(range(1, 4))
+        assert booked_days <= set(unavailable), (
+            f"Booked days {sorted(booked_days)} are not all unavailable: {unavailable}"
+        )
 
     @pytest.mark.ui_test_4
     def test_page_loads_with_interactive_booking_elements(self, ui_app, home_page,
@@ -129,6 +118,22 @@ class TestUserUI:
         """UI Test 4: Page Interactive"""
         page = ui_app.page
         booking_page.wait_for_rooms_to_load(page)
-        content = page.content()
-        assert len(content) > UIConstants.MIN_PAGE_CONTENT_LENGTH
-        assert home_page.count_booking_elements(page) > 0
+        state = home_page.probe_state(page, until="booking_elements")
+        assert state.content_length > UIConstants.MIN_PAGE_CONTENT_LENGTH
+        assert state.booking_elements > 0, state
+
+    @pytest.mark.ui_test_5
+    def test_stay_is_selected_on_calendar(self, ui_app, home_page, booking_page):
+        """UI Test 5: Stay selection by exact calendar cells"""
+        page = ui_app.page
+        booking_page.wait_for_rooms_to_load(page)
+        home_page.click_element(page, booking_page.BOOKING_BUTTON_SELECTORS)
+
+        # Nights in the middle of next month
+        next_month = (date.today().replace(day=1) + timedelta(days=32)).replace(day=1)
+        checkin, checkout = next_month.replace(day=10), next_month.replace(day=13)
+        first, last = booking_page.select_stay(page, checkin, checkout)
+
+        assert first.day == checkin.day and first.in_month, first
+        assert last.in_month and checkin.day < last.day <= checkout.day, last
+        assert not first.unavailable and not last.unavailable, (first, last)
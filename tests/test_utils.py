@@ -0,0 +1,583 @@
+import asyncio
+import json
+import threading
+import time
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pytest
+from loguru import logger
+
+from page_object.async_booking_page import AsyncBookingComponent
+from page_object.booking_page import BookingComponent
+from page_object.calendar import CalendarDriver, CalendarMonth
+from utils import utils_api
+from utils.async_ui_runner import AsyncBookingRunner
+from utils.adaptive_timeouts import AdaptiveTimeouts
+from utils.constants_ui import UIConstants
+from utils.duration_scheduler import (
+    DurationHistory,
+    DurationSchedulingPlugin,
+    predict_makespan,
+    strip_group
+)
+from utils.json_stream import iter_array_items
+from utils.lazy_dataset import DatasetIndex
+from utils.models import Booking, ModelCollection, Room
+from utils.rate_limiter import SharedRateLimiter
+from utils.result_cache import DependencyIndex
+from utils.single_flight import SingleFlight
+from utils.structured_logging import BackgroundJsonSink, StructuredLogger, api_log
+from utils.transports import InProcessTransport, RequestsTransport, Transport, create_transport
+from utils.utils_api import BookingUtils
+from utils.warm_up import SessionWarmUp
+
+
+@pytest.mark.unit
+class TestAdaptiveTimeouts:
+    """Timeouts learned from observed wait durations"""
+
+    def test_timeout_shrinks_to_floor_after_fast_waits(self, tmp_path):
+        store = AdaptiveTimeouts(tmp_path / "timeouts.json", min_samples=5)
+        for _ in range(5):
+            store.record("group", 10)
+        assert store.get("group", 10000, floor=2000) == 2000
+
+    def test_timed_out_wait_raises_timeout_again(self, tmp_path):
+        store = AdaptiveTimeouts(tmp_path / "timeouts.json", min_samples=5)
+        for _ in range(20):
+            store.record("group", 10)
+        store.record_timeout("group", 2000)
+        assert store.get("group", 10000, floor=2000) == 3000
+        store.record_timeout("group", 3000)
+        assert store.get("group", 10000, floor=2000) == 4500
+        # Beyond the default, up to the ceiling, in slower environments
+        store.record_timeout("group", 9000)
+        assert store.get("group", 10000, floor=2000) == 13500
+        store.record_timeout("group", 40000)
+        assert store.get("group", 10000, floor=2000) == UIConstants.ADAPTIVE_TIMEOUT_CEILING
+
+    def test_measure_records_durations_and_censored_timeouts(self, tmp_path):
+        store = AdaptiveTimeouts(tmp_path / "timeouts.json", min_samples=1)
+        with store.measure("group", 10000) as wait:
+            assert wait.timeout == 10000
+        assert store._samples["group"][0][1] is False and wait.elapsed_ms < 100
+        with pytest.raises(TimeoutError):
+            with store.measure("group", 10000, timeout=50, timeout_errors=TimeoutError):
+                raise TimeoutError
+        assert store._samples["group"][-1] == [50, True]
+
+    def test_absent_element_probes_are_not_censored(self, tmp_path):
+        store = AdaptiveTimeouts(tmp_path / "timeouts.json", min_samples=1)
+        with pytest.raises(TimeoutError):
+            with store.measure("probe", 3000, timeout=50, timeout_errors=TimeoutError, censor=False):
+                raise TimeoutError
+        assert "probe" not in store._samples
+
+    def test_samples_are_merged_into_the_store(self, tmp_path):
+        path = tmp_path / "timeouts.json"
+        path.write_text('{"group": [100, 200]}')
+        store = AdaptiveTimeouts(path, min_samples=3)
+        store.record_timeout("group", 3000)
+        store.save()
+        assert AdaptiveTimeouts(path, min_samples=3).get("group", 10000, floor=0) == 4500
+
+
+def _fail():
+    raise RuntimeError("launch failed")
+
+
+@pytest.mark.unit
+class TestWarmUp:
+    """Warm-up steps and the cached admin token"""
+
+    def test_best_effort_step_failure_returns_none(self):
+        assert SessionWarmUp(None).run("api_connections", _fail) is None
+
+    def test_critical_step_failure_is_raised(self):
+        with pytest.raises(RuntimeError, match="launch failed"):
+            SessionWarmUp(None).run("browser_launch", _fail, critical=True)
+
+    def test_warm_up_time_ends_with_the_last_step(self, inprocess_utils):
+        messages = []
+        handler = logger.add(messages.append, format="{message}")
+        warm_up = SessionWarmUp(inprocess_utils)
+        warm_up.start()
+        time.sleep(0.2)
+        try:
+            warm_up.wait()
+        finally:
+            logger.remove(handler)
+        assert set(warm_up.timings) == {"api_connections", "admin_token"}
+        total = float(messages[-1].split(" in ")[1].split("s ")[0])
+        assert total < 0.2
+
+    def test_rejected_admin_token_is_refreshed(self, inprocess_utils):
+        booking_utils = inprocess_utils
+        token = booking_utils.get_cached_admin_token()
+        assert booking_utils.get_cached_admin_token() == token
+        # The server forgets the token, e.g. after it expired
+        booking_utils.transport.app.tokens.clear()
+        headers = {"Cookie": f"token={token}", "User-Agent": "pytest"}
+        response = booking_utils._request(
+            "DELETE", f"{booking_utils.base_url}/api/room/1", headers=headers
+        )
+        assert response.status_code == 401
+        refreshed = booking_utils.get_cached_admin_token()
+        assert refreshed is not None and refreshed != token
+
+
+@pytest.mark.unit
+class TestAsyncUiRunner:
+    """Async page objects and scenario isolation"""
+
+    def test_async_component_is_not_a_sync_component(self):
+        assert not issubclass(AsyncBookingComponent, BookingComponent)
+        assert AsyncBookingComponent.BOOKING_FORM_SELECTORS is BookingComponent.BOOKING_FORM_SELECTORS
+
+    def test_context_failure_fails_only_its_scenario(self):
+        class Browser:
+            async def new_context(self):
+                raise RuntimeError("context crashed")
+
+        runner = AsyncBookingRunner("https://example.test", {})
+        result = asyncio.run(runner.run_scenario(Browser(), asyncio.Semaphore(1), 1, "valid"))
+        assert result["passed"] is False and result["error"] == "context crashed"
+
+
+@pytest.mark.unit
+class TestTransports:
+    """Transport selection"""
+
+    def test_transport_interface_is_abstract(self):
+        with pytest.raises(TypeError):
+            Transport()
+
+    def test_environment_variable_overrides_test_data(self, monkeypatch):
+        monkeypatch.setenv("BOOKING_TRANSPORT", "inprocess")
+        assert isinstance(create_transport(default="requests"), InProcessTransport)
+        monkeypatch.delenv("BOOKING_TRANSPORT")
+        assert isinstance(create_transport(default="requests"), RequestsTransport)
+        assert isinstance(create_transport("inprocess", default="requests"), InProcessTransport)
+
+    def test_session_of_requests_transport_is_still_available(self):
+        booking_utils = BookingUtils(transport="requests")
+        with pytest.deprecated_call():
+            assert booking_utils.session is booking_utils.transport.session
+
+    def test_timings_are_grouped_per_transport(self, inprocess_utils):
+        inprocess_utils.get_available_rooms()
+        assert inprocess_utils.endpoint_group(
+            "GET", f"{inprocess_utils.base_url}/api/room/3"
+        ) == "api:inprocess:GET /api/room/{id}"
+        assert set(utils_api.timeouts._new_samples) == {"api:inprocess:GET /api/room"}
+
+
+@pytest.mark.unit
+class TestSingleFlight:
+    """Coalescing of concurrent identical GETs"""
+
+    URL = "https://example.test/api/room/"
+
+    def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return {"rooms": [1]}
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flight.do(self.URL, "key", fetch)))
+        leader.start()
+        started.wait(5)
+        follower = threading.Thread(target=lambda: results.append(flight.do(self.URL, "key", fetch)))
+        follower.start()
+        while flight.coalesced == 0:
+            pass
+        release.set()
+        leader.join()
+        follower.join()
+        assert len(calls) == 1
+        assert results == [{"rooms": [1]}, {"rooms": [1]}]
+        # Each caller gets its own copy
+        assert results[0] is not results[1]
+
+    def test_caller_after_invalidation_does_not_join_older_call(self):
+        flight = SingleFlight()
+        state = {"value": "old"}
+        started, release = threading.Event(), threading.Event()
+
+        def slow_fetch():
+            value = state["value"]
+            started.set()
+            release.wait(5)
+            return value
+
+        leader = threading.Thread(target=flight.do, args=(self.URL, "key", slow_fetch))
+        leader.start()
+        started.wait(5)
+        # A write lands while the GET that read the old state is in flight
+        state["value"] = "new"
+        flight.invalidate(f"{self.URL}1")
+        try:
+            assert flight.do(self.URL, "key", lambda: state["value"]) == "new"
+        finally:
+            release.set()
+            leader.join()
+        assert flight.coalesced == 0
+
+    def test_results_read_before_invalidation_are_not_stored(self):
+        flight = SingleFlight(result_ttl=60)
+        assert flight.do(self.URL, "key", lambda: "old") == "old"
+        assert flight.do(self.URL, "key", lambda: "unused") == "old"
+        flight.invalidate(self.URL)
+        assert flight.do(self.URL, "key", lambda: "new") == "new"
+
+
+@pytest.mark.unit
+class TestJsonStream:
+    """Incremental parsing of array items from body chunks"""
+
+    DOCUMENT = (
+        '{"total": {"rooms": [0]}, "rooms": [{"roomid": 1, "roomName": "Caf\u00e9 \\\"101\\\""}, '
+        '{"roomid": 2, "roomName": "Zimmer äöü ☃", "features": ["TV", "[{x}]"]}, '
+        '5, "text", [{"roomid": 99}], null, {"roomid": 3, "nested": {"rooms": [{"roomid": 98}]}}], '
+        '"rooms_after": [{"roomid": 97}]}'
+    ).encode()
+
+    @staticmethod
+    def chunked(data, size):
+        return (data[start:start + size] for start in range(0, len(data), size))
+
+    def test_items_match_full_parse_for_every_chunk_size(self):
+        expected = [item for item in json.loads(self.DOCUMENT)["rooms"] if isinstance(item, dict)]
+        for size in range(1, len(self.DOCUMENT) + 1):
+            items = list(iter_array_items(self.chunked(self.DOCUMENT, size), "rooms"))
+            assert items == expected, f"chunk size {size}"
+
+    def test_split_at_every_position(self):
+        for split in range(len(self.DOCUMENT) + 1):
+            chunks = [self.DOCUMENT[:split], self.DOCUMENT[split:]]
+            assert [item["roomid"] for item in iter_array_items(chunks, "rooms")] == [1, 2, 3]
+
+    def test_non_object_items_are_skipped(self):
+        chunks = [b'{"rooms": [[1, 2], [{"roomid": 5}], 7, "x", true, {"roomid": 6}]}']
+        assert list(iter_array_items(chunks, "rooms")) == [{"roomid": 6}]
+
+
+def _grid(days_before, days_in_month, days_after):
+    """Cells of a month grid with trailing and leading days of the adjacent months"""
+    days = (
+        [(day, False) for day in days_before]
+        + [(day, True) for day in range(1, days_in_month + 1)]
+        + [(day, False) for day in range(1, days_after + 1)]
+    )
+    return [
+        {"index": index, "day": day, "in_month": in_month, "unavailable": day == 2 and in_month,
+         "x": 0, "y": 0}
+        for index, (day, in_month) in enumerate(days)
+    ]
+
+
+@pytest.mark.unit
+class TestCalendarMonth:
+    """Month grid model of the calendar driver"""
+
+    def test_cells_of_shown_and_adjacent_months(self):
+        month = CalendarMonth("October 2026", _grid([28, 29, 30], 31, 4))
+        assert month.steps_to(date(2027, 1, 5)) == 3
+        assert month.cell_for(date(2026, 10, 29)).index == 31
+        assert month.cell_for(date(2026, 9, 29)).index == 1
+        assert month.cell_for(date(2026, 11, 2)).index == 35
+        assert month.cell_for(date(2026, 12, 1)) is None
+        assert month.unavailable_days() == [2]
+
+    def test_abbreviated_label(self):
+        assert CalendarMonth("Oct 2026", _grid([], 31, 0)).month == 10
+
+    def test_unknown_label_format_fails_clearly(self):
+        with pytest.raises(AssertionError, match="Unrecognized calendar month label"):
+            CalendarMonth("2026/10", _grid([], 31, 0))
+
+    def test_missing_calendar_or_label_fails(self):
+        with pytest.raises(AssertionError, match="No calendar is shown"):
+            CalendarMonth(None, [])
+        with pytest.raises(AssertionError, match="no month label"):
+            CalendarMonth(None, _grid([], 31, 0))
+
+    def test_dates_are_clicked_inside_the_calendar_that_was_read(self):
+        page = _CalendarPage({"label": "October 2026", "kind": "datepicker", "cells": _grid([28, 29, 30], 31, 4)})
+        CalendarDriver.select_date(page, date(2026, 10, 29))
+        assert page.evaluated["kind"] is None
+        assert page.clicked == [".react-datepicker", ".react-datepicker__day", 31]
+
+
+class _CalendarPage:
+    """Page stand-in returning one calendar snapshot and recording the clicked locator chain"""
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.evaluated = None
+        self.clicked = None
+
+    def evaluate(self, script, arguments):
+        self.evaluated = arguments
+        return self.snapshot
+
+    def locator(self, selector, chain=()):
+        page, chain = self, chain + (selector,)
+        return SimpleNamespace(
+            first=SimpleNamespace(locator=lambda inner: page.locator(inner, chain)),
+            nth=lambda index: SimpleNamespace(click=lambda: setattr(page, "clicked", [*chain, index]))
+        )
+
+
+class _Message:
+    """Loguru message stand-in carrying only the record"""
+
+    def __init__(self, index):
+        self.record = {
+            "time": datetime.now(), "level": _Level(), "name": "test", "function": "f",
+            "line": index, "extra": {"event": "e", "payload": "x" * 100}
+        }
+
+
+class _Level:
+    name = "DEBUG"
+
+
+@pytest.mark.unit
+class TestStructuredLogging:
+    """Background JSON sink and sampling configuration"""
+
+    def test_file_rotates_under_sustained_logging(self, tmp_path):
+        path = tmp_path / "api_log.jsonl"
+        sink = BackgroundJsonSink(str(path), max_bytes=2000, backups=2)
+        for index in range(200):
+            sink(_Message(index))
+        sink.close()
+        assert path.stat().st_size < 2000
+        assert (tmp_path / "api_log.jsonl.1").stat().st_size < 2200
+        assert (tmp_path / "api_log.jsonl.2").exists()
+        assert not (tmp_path / "api_log.jsonl.3").exists()
+        assert sink.dropped == 0
+
+    def test_sampling_rates_are_validated(self):
+        assert StructuredLogger.parse_sampling("debug=0.01, INFO=1") == {"DEBUG": 0.01, "INFO": 1.0}
+        for text in ("DEBUG=lots", "VERBOSE=0.5", "INFO=2"):
+            with pytest.raises(ValueError):
+                StructuredLogger.parse_sampling(text)
+
+
+@pytest.mark.unit
+class TestModels:
+    """Room and Booking models"""
+
+    ROOM = {"roomid": 3, "roomName": "101", "type": "Single", "features": ["TV", "WiFi"], "roomPrice": 100}
+
+    def test_models_are_hashable_values(self):
+        room, same = Room.from_dict(self.ROOM), Room.from_dict(dict(self.ROOM))
+        assert room == same and hash(room) == hash(same)
+        assert len({room, same}) == 1
+        assert {room: "cached"}[same] == "cached"
+        assert room.features == ("TV", "WiFi")
+
+    def test_models_are_immutable(self):
+        room = Room.from_dict(self.ROOM)
+        with pytest.raises(AttributeError):
+            room.price = 1
+
+    def test_round_trip_and_lookups(self):
+        booking = Booking.from_dict({
+            "bookingid": 7, "booking": {"roomid": 3, "firstname": "Ann",
+                                        "bookingdates": {"checkin": "2026-12-12", "checkout": "2026-12-16"}}
+        })
+        assert Booking.from_dict(booking.to_dict()) == booking
+        rooms = ModelCollection.of(Room, [self.ROOM, {**self.ROOM, "roomid": 4, "roomName": "102"}])
+        assert rooms.by_id(4).name == "102"
+        assert rooms.first(type="Single", name="102").room_id == 4
+
+    def test_room_writes_return_models(self, admin_headers_inprocess):
+        booking_utils, headers = admin_headers_inprocess
+        created = booking_utils.create_room(booking_utils.room_api_base, self.ROOM, headers)
+        assert isinstance(created, Room) and created.name == "101"
+        updated = booking_utils.update_room(created.room_id, {**self.ROOM, "roomPrice": 150}, headers)
+        assert updated == Room.from_dict({**self.ROOM, "roomid": created.room_id, "roomPrice": 150})
+
+
+@pytest.mark.unit
+class TestConditionalGets:
+    """ETag cache of _get_json and the wait_until deadline"""
+
+    def test_unchanged_rooms_come_from_the_etag_cache(self, inprocess_utils):
+        booking_utils = inprocess_utils
+        first, second = booking_utils.get_available_rooms(), booking_utils.get_available_rooms()
+        assert first == second and first is not second
+        etag, cached = next(iter(booking_utils._etags.values()))
+        assert isinstance(cached, tuple) and all(isinstance(room, Room) for room in cached)
+
+    def test_polled_booking_details_reuse_the_admin_token(self, admin_headers_inprocess, monkeypatch):
+        booking_utils, headers = admin_headers_inprocess
+        room_id = booking_utils.create_room(booking_utils.room_api_base, TestModels.ROOM, headers).room_id
+        booking_id = booking_utils.create_test_booking(room_id, None)
+        logins = []
+        login = booking_utils.get_admin_auth_token
+        monkeypatch.setattr(booking_utils, "get_admin_auth_token", lambda: logins.append(1) or login())
+        first = booking_utils.get_booking_details(booking_id)
+        assert booking_utils.get_booking_details(booking_id) == first is not None
+        assert logins == []
+        assert len([key for key in booking_utils._etags if "/api/booking/" in key[0]]) == 1
+
+    def test_etag_cache_keeps_most_recent_gets(self, inprocess_utils, monkeypatch):
+        monkeypatch.setattr(UIConstants, "ETAG_CACHE_SIZE", 2)
+        booking_utils = inprocess_utils
+        url = f"{booking_utils.base_url}/api/room/"
+        for cookie in ("a", "b", "a", "c"):
+            booking_utils._get_json(url, headers={"Cookie": cookie}, parse=tuple)
+        assert list(booking_utils._etags) == [(url, "a"), (url, "c")]
+
+    def test_wait_until_deadline_is_fixed(self, inprocess_utils, monkeypatch):
+        recorded = []
+        monkeypatch.setattr(utils_api.timeouts, "get", lambda *args, **kwargs: 1)
+        monkeypatch.setattr(
+            utils_api.timeouts, "record_timeout", lambda group, ms: recorded.append((group, ms))
+        )
+        booking_utils = inprocess_utils
+        calls = iter(range(100))
+        value = booking_utils.wait_until(lambda: next(calls), lambda n: n >= 2, name="count", interval=0.01)
+        assert value == 2
+        booking_utils.wait_until(lambda: False, name="never", timeout=50, interval=0.01)
+        assert recorded == [("wait:never", 50)]
+
+
+@pytest.mark.unit
+class TestRateLimiter:
+    """File-locked token bucket of SharedRateLimiter"""
+
+    def test_endpoint_classes(self):
+        assert SharedRateLimiter.endpoint_class("POST", "https://host/api/auth/login") == "auth"
+        assert SharedRateLimiter.endpoint_class("head", "https://host/api/room/") == "read"
+        assert SharedRateLimiter.endpoint_class("DELETE", "https://host/api/room/1") == "write"
+
+    def test_burst_then_waits_for_the_rate(self, tmp_path):
+        limiter = SharedRateLimiter({"read": (10, 2)}, state_path=str(tmp_path / "bucket.json"))
+        waits = [limiter.reserve("read") for _ in range(4)]
+        assert waits[:2] == [0.0, 0.0]
+        assert waits[2] == pytest.approx(0.1, abs=0.02) and waits[3] == pytest.approx(0.2, abs=0.02)
+
+    def test_bucket_is_shared_through_the_state_file(self, tmp_path):
+        state_path = str(tmp_path / "bucket.json")
+        SharedRateLimiter({"write": (1, 1)}, state_path=state_path).reserve("write")
+        assert SharedRateLimiter({"write": (1, 1)}, state_path=state_path).reserve("write") > 0.9
+
+
+@pytest.mark.unit
+class TestLazyDataset:
+    """Offset index of JSON lines datasets"""
+
+    @pytest.fixture
+    def dataset(self, tmp_path):
+        path = tmp_path / "cases.jsonl"
+        path.write_text(
+            '{"id": "a", "tags": ["email"], "value": 1}\n\n'
+            '{"tags": ["phone"], "value": 2}\n'
+            '{"id": "c", "tags": ["email", "phone"], "value": 3}\n'
+        )
+        return path
+
+    def test_cases_are_filtered_by_tag_and_loaded_lazily(self, dataset):
+        index = DatasetIndex(dataset)
+        assert [case.case_id for case in index.cases()] == ["a", "cases-3", "c"]
+        assert [case.case_id for case in index.cases(["phone"])] == ["cases-3", "c"]
+        assert [case.load()["value"] for case in index.cases(["email"])] == [1, 3]
+
+    def test_index_is_rebuilt_when_the_dataset_changes(self, dataset):
+        DatasetIndex(dataset).entries()
+        assert DatasetIndex(dataset).index_path.is_file()
+        with open(dataset, "a") as file:
+            file.write('{"id": "d", "value": 4}\n')
+        cases = DatasetIndex(dataset).cases()
+        assert cases[-1].case_id == "d" and cases[-1].load()["value"] == 4
+
+
+@pytest.mark.unit
+class TestDurationScheduler:
+    """Duration history and longest-first makespan"""
+
+    def test_strip_group(self):
+        assert strip_group("tests/test_a.py::test_x@admin_api") == "tests/test_a.py::test_x"
+        assert strip_group("tests/test_a.py::test_x[a@b.com]") == "tests/test_a.py::test_x[a@b.com]"
+        assert strip_group("tests/test_a.py::test_x[a@b.com]@group") == "tests/test_a.py::test_x[a@b.com]"
+
+    def test_estimates_fall_back_to_module_and_global_medians(self, tmp_path):
+        path = tmp_path / "durations.json"
+        path.write_text(json.dumps({"a.py::t1": 1.0, "a.py::t2": 3.0, "b.py::t1": 10.0}))
+        history = DurationHistory(str(path))
+        assert history.estimate("a.py::t1@group") == 1.0
+        assert history.estimate("a.py::new") == 2.0
+        assert history.estimate("c.py::new") == 3.0
+
+    def test_update_blends_and_saves(self, tmp_path):
+        path = tmp_path / "durations.json"
+        history = DurationHistory(str(path), smoothing=0.5)
+        history.update({"a.py::t1": 2.0})
+        history.update({"a.py::t1": 4.0, "a.py::t2": 1.0})
+        assert DurationHistory(str(path)).durations == {"a.py::t1": 3.0, "a.py::t2": 1.0}
+
+    def test_predict_makespan(self):
+        assert predict_makespan([3, 3, 2, 2, 2], 2) == 7
+        assert predict_makespan([1, 2], 0) == 3
+        assert predict_makespan([], 4) == 0
+
+    def test_durations_include_setup_and_teardown_of_tests_that_ran(self, tmp_path):
+        plugin = DurationSchedulingPlugin(SimpleNamespace(option=SimpleNamespace()), str(tmp_path / "d.json"))
+        reports = [
+            ("ui.py::slow@group", "setup", 2.0, False), ("ui.py::slow@group", "call", 0.5, False),
+            ("ui.py::slow@group", "teardown", 0.25, False),
+            ("ui.py::cached", "setup", 0.01, True), ("ui.py::cached", "teardown", 0.01, False),
+        ]
+        for nodeid, when, duration, skipped in reports:
+            plugin.pytest_runtest_logreport(
+                SimpleNamespace(nodeid=nodeid, when=when, duration=duration, skipped=skipped)
+            )
+        assert dict(plugin.measured) == {"ui.py::slow": 2.75}
+
+
+@pytest.mark.unit
+class TestDependencyIndex:
+    """Local import closure used by the result cache"""
+
+    def test_imports_are_followed_recursively_within_the_root(self, tmp_path):
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "__init__.py").write_text("")
+        (tmp_path / "a.py").write_text("import os\nfrom pkg import b\n")
+        (tmp_path / "pkg" / "b.py").write_text("from pkg.c import VALUE\n")
+        (tmp_path / "pkg" / "c.py").write_text("import a\nVALUE = 1\n")
+        index = DependencyIndex(tmp_path)
+        names = {path.relative_to(tmp_path.resolve()).as_posix() for path in index.imports(tmp_path / "a.py")}
+        assert names == {"a.py", "pkg/__init__.py", "pkg/b.py", "pkg/c.py"}
+        assert not index.is_local(json.__file__)
+
+
+@pytest.fixture
+def inprocess_utils(tmp_path, monkeypatch):
+    """
+    BookingUtils on the in-process stand-in API. Its timings go to a
+    temporary timeouts store and no API events are logged, so unit runs
+    leave .adaptive_timeouts.json and api_log.jsonl alone.
+    """
+    monkeypatch.setattr(utils_api, "timeouts", AdaptiveTimeouts(tmp_path / "timeouts.json"))
+    monkeypatch.setattr(api_log, "sampling", {"DEBUG": 0.0, "INFO": 0.0, "WARNING": 0.0})
+    return BookingUtils(transport="inprocess")
+
+
+@pytest.fixture
+def admin_headers_inprocess(inprocess_utils):
+    """BookingUtils on the in-process stand-in API with admin headers"""
+    booking_utils = inprocess_utils
+    headers = {"Cookie": f"token={booking_utils.get_cached_admin_token()}", "User-Agent": "pytest"}
+    return booking_utils, headers
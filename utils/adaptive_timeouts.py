@@ -0,0 +1,154 @@
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from loguru import logger
+
+from utils.constants_ui import UIConstants
+
+
+class MeasuredWait:
+    """Timeout (ms) of a measured wait and, once it ended, its duration (ms)"""
+
+    __slots__ = ("timeout", "elapsed_ms")
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self.elapsed_ms = None
+
+
+class AdaptiveTimeouts:
+    """
+    Timeouts derived from wait durations observed in previous runs.
+    Samples are stored as [duration_ms, timed_out] pairs: a wait that
+    timed out is a censored sample at its timeout value (the real duration
+    was at least that long), so a slower environment raises the timeout again.
+    """
+
+    def __init__(
+            self,
+            store_path=UIConstants.ADAPTIVE_TIMEOUTS_FILE,
+            percentile=UIConstants.ADAPTIVE_TIMEOUT_PERCENTILE,
+            margin=UIConstants.ADAPTIVE_TIMEOUT_MARGIN,
+            max_samples=UIConstants.ADAPTIVE_TIMEOUT_MAX_SAMPLES,
+            min_samples=UIConstants.ADAPTIVE_TIMEOUT_MIN_SAMPLES
+    ):
+        self.store_path = Path(store_path)
+        self.percentile = percentile
+        self.margin = margin
+        self.max_samples = max_samples
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self._samples = self._load()
+        self._new_samples = {}
+
+    def _load(self):
+        """Load samples stored by previous runs"""
+        try:
+            with open(self.store_path, 'r') as file:
+                data = json.load(file)
+            # Files of older runs store plain durations of completed waits
+            return {
+                group: [
+                    [value, False] if isinstance(value, (int, float)) else [value[0], bool(value[1])]
+                    for value in values
+                ]
+                for group, values in data.items()
+            }
+        except FileNotFoundError:
+            return {}
+        except (json.JSONDecodeError, AttributeError, TypeError, IndexError) as e:
+            logger.info(f"Ignoring invalid timeouts file {self.store_path}: {e}")
+            return {}
+
+    def record(self, group, duration_ms, timed_out=False):
+        """Record an observed wait duration (ms) for a selector group or endpoint"""
+        with self._lock:
+            for samples in (self._samples, self._new_samples):
+                values = samples.setdefault(group, [])
+                values.append([round(duration_ms, 1), timed_out])
+                del values[:-self.max_samples]
+
+    def record_timeout(self, group, timeout_ms):
+        """Record a wait that did not complete within timeout_ms"""
+        self.record(group, timeout_ms, timed_out=True)
+
+    def get(self, group, default, floor=None, ceiling=None):
+        """
+        Returns the timeout (ms) for a group: a high percentile of the
+        observed durations with a safety margin, clamped to [floor, ceiling].
+        After a timed out wait it is at least that timeout with the margin,
+        until the censored sample ages out of the retained samples.
+        Falls back to the default until enough samples are collected.
+        The ceiling defaults to ADAPTIVE_TIMEOUT_CEILING (or the default if
+        higher), so it can grow beyond the default in slower environments.
+        """
+        floor = UIConstants.ADAPTIVE_TIMEOUT_FLOOR if floor is None else floor
+        if ceiling is None:
+            ceiling = max(UIConstants.ADAPTIVE_TIMEOUT_CEILING, default)
+        with self._lock:
+            samples = list(self._samples.get(group, []))
+        if len(samples) < self.min_samples:
+            return default
+        values = sorted(duration for duration, _ in samples)
+        rank = max(math.ceil(self.percentile / 100 * len(values)) - 1, 0)
+        learned = max(
+            [values[rank]] + [duration for duration, timed_out in samples if timed_out]
+        ) * self.margin
+        return int(min(max(learned, floor), ceiling))
+
+    @contextmanager
+    def measure(self, group, default, timeout=None, floor=None, ceiling=None,
+                timeout_errors=(), censor=True):
+        """
+        Times the wait in the with block and records it under the group.
+        Yields a MeasuredWait whose timeout (ms) is the given one or the
+        learned one (see get). When the block raises one of timeout_errors,
+        or raises after the timeout passed, the wait is recorded as censored
+        at its timeout - unless censor is False, as for probes of elements
+        that may be absent, where a timeout says nothing about slowness.
+        """
+        if timeout is None:
+            timeout = self.get(group, default, floor=floor, ceiling=ceiling)
+        wait = MeasuredWait(timeout)
+        started = time.perf_counter()
+        try:
+            yield wait
+        except Exception as e:
+            wait.elapsed_ms = (time.perf_counter() - started) * 1000
+            if censor and (isinstance(e, timeout_errors) or wait.elapsed_ms >= timeout):
+                self.record_timeout(group, timeout)
+            raise
+        wait.elapsed_ms = (time.perf_counter() - started) * 1000
+        self.record(group, wait.elapsed_ms)
+
+    def save(self):
+        """
+        Merge samples recorded in this process into the store file.
+        Re-reads the file first so that parallel workers do not overwrite
+        each other's samples.
+        """
+        with self._lock:
+            if not self._new_samples:
+                return
+            stored = self._load()
+            for group, values in self._new_samples.items():
+                merged = stored.get(group, []) + values
+                stored[group] = merged[-self.max_samples:]
+            self._new_samples = {}
+        tmp_path = self.store_path.with_name(
+            f"{self.store_path.name}.{os.getpid()}.tmp"
+        )
+        try:
+            with open(tmp_path, 'w') as file:
+                json.dump(stored, file)
+            os.replace(tmp_path, self.store_path)
+        except OSError as e:
+            logger.info(f"Failed to save timeouts to {self.store_path}: {e}")
+
+
+timeouts = AdaptiveTimeouts()
@@ -0,0 +1,129 @@
+"""
+Runs many independent booking scenarios as concurrent pages inside a single
+browser and event loop.
+
+Usage:
+    python -m utils.async_ui_runner --scenarios 40 --concurrency 8
+"""
+import argparse
+import asyncio
+import time
+
+from loguru import logger
+from playwright.async_api import async_playwright
+
+from page_object.async_booking_page import AsyncBookingComponent
+from page_object.async_home_page import AsyncHomePage
+from page_object.base_page import BasePage
+from utils.utils_api import BookingUtils
+
+
+class AsyncBookingRunner:
+    """Executes booking scenarios in isolated contexts of one shared browser"""
+
+    SCENARIOS = ("valid", "invalid")
+
+    def __init__(self, base_url, test_data, concurrency=8, headless=True):
+        self.base_url = base_url
+        self.test_data = test_data
+        self.concurrency = concurrency
+        self.headless = headless
+        self.home_page = AsyncHomePage()
+        self.booking_page = AsyncBookingComponent()
+
+    async def run_scenario(self, browser, semaphore, index, scenario):
+        """Run one scenario in its own browser context"""
+        async with semaphore:
+            started = time.perf_counter()
+            context = None
+            try:
+                # A context that fails to open fails this scenario only
+                context = await browser.new_context()
+                page = await context.new_page()
+                await page.goto(self.base_url)
+                await self.booking_page.wait_for_rooms_to_load(page)
+                await self.home_page.click_element(
+                    page, self.booking_page.BOOKING_BUTTON_SELECTORS
+                )
+                booking_data = self.test_data[f"{scenario}_booking_data"]
+                _, elements = await self.booking_page.fill_booking_form(
+                    page, booking_data
+                )
+                if "book_button" in elements:
+                    await elements["book_button"].click()
+                else:
+                    await self.home_page.click_element(
+                        page, BasePage.SUBMIT_BUTTON_SELECTORS
+                    )
+                passed = await self.check_result(page, scenario)
+                error = None
+            except Exception as e:
+                passed, error = False, str(e)
+            finally:
+                if context is not None:
+                    await context.close()
+            duration = time.perf_counter() - started
+            logger.info(
+                f"Scenario #{index} ({scenario}): "
+                f"{'passed' if passed else 'failed'} in {duration:.2f}s"
+            )
+            return {
+                "index": index,
+                "scenario": scenario,
+                "passed": passed,
+                "duration": duration,
+                "error": error
+            }
+
+    async def check_result(self, page, scenario):
+        state = await self.home_page.probe_state(page)
+        keywords = (
+            state.success_keywords if scenario == "valid" else state.error_keywords
+        )
+        return state.indicator_visible or bool(keywords)
+
+    async def run(self, scenarios):
+        """Run the scenarios with at most `concurrency` pages open at a time"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        async with async_playwright() as playwright:
+            browser = await playwright.chromium.launch(headless=self.headless)
+            try:
+                return await asyncio.gather(*(
+                    self.run_scenario(browser, semaphore, index, scenario)
+                    for index, scenario in enumerate(scenarios)
+                ))
+            finally:
+                await browser.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent async booking scenarios")
+    parser.add_argument("--scenarios", type=int, default=20,
+                        help="Number of scenarios to run")
+    parser.add_argument("--scenario", choices=AsyncBookingRunner.SCENARIOS,
+                        default="invalid", help="Booking data used by the scenarios")
+    parser.add_argument("--concurrency", type=int, default=8,
+                        help="Maximum number of pages open at the same time")
+    parser.add_argument("--headed", action="store_true",
+                        help="Run the browser with a visible window")
+    args = parser.parse_args(argv)
+
+    utils = BookingUtils()
+    runner = AsyncBookingRunner(
+        utils.base_url,
+        utils.test_data,
+        concurrency=args.concurrency,
+        headless=not args.headed
+    )
+    started = time.perf_counter()
+    results = asyncio.run(runner.run([args.scenario] * args.scenarios))
+    passed = sum(result["passed"] for result in results)
+    logger.info(
+        f"{passed}/{len(results)} scenarios passed in "
+        f"{time.perf_counter() - started:.2f}s (concurrency {args.concurrency})"
+    )
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
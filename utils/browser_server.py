@@ -0,0 +1,226 @@
+"""
+Shared Chromium servers for xdist workers.
+
+The pytest controller starts a small number of Chromium processes with a
+remote debugging port and exports their endpoints in SHARED_BROWSER_ENDPOINTS.
+Workers connect over CDP and only create lightweight contexts.
+
+Servers can also be started once per host and reused by several runs:
+    python -m utils.browser_server --servers 2
+"""
+import argparse
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+
+import requests
+from loguru import logger
+
+ENDPOINTS_ENV = "SHARED_BROWSER_ENDPOINTS"
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def chromium_executable():
+    """Returns the path of the Chromium build installed by Playwright"""
+    from playwright.sync_api import sync_playwright
+    with sync_playwright() as playwright:
+        return playwright.chromium.executable_path
+
+
+class BrowserServer:
+    """One Chromium process listening on a local remote debugging port"""
+
+    def __init__(self, executable, port=None, headless=True):
+        self.executable = executable
+        self.port = port or free_port()
+        self.headless = headless
+        self.process = None
+        self.user_data_dir = None
+        self.restarts = 0
+
+    @property
+    def endpoint(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self, timeout=30):
+        self.user_data_dir = tempfile.mkdtemp(prefix="shared-browser-")
+        args = [
+            self.executable,
+            f"--remote-debugging-port={self.port}",
+            f"--user-data-dir={self.user_data_dir}",
+            "--no-sandbox",
+            "--disable-setuid-sandbox",
+            "--no-first-run",
+            "--no-default-browser-check",
+            "about:blank"
+        ]
+        if self.headless:
+            args.insert(1, "--headless=new")
+        self.process = subprocess.Popen(
+            args,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        deadline = time.monotonic() + timeout
+        while not self.is_healthy():
+            if self.process.poll() is not None or time.monotonic() > deadline:
+                self.stop()
+                raise RuntimeError(f"Browser server on port {self.port} did not start")
+            time.sleep(0.2)
+        logger.info(f"Browser server started at {self.endpoint}")
+
+    def is_healthy(self):
+        """The server is healthy if it runs and answers the CDP version request"""
+        if self.process is None or self.process.poll() is not None:
+            return False
+        try:
+            return requests.get(f"{self.endpoint}/json/version", timeout=2).ok
+        except requests.RequestException:
+            return False
+
+    def restart(self):
+        self.stop()
+        self.restarts += 1
+        self.start()
+
+    def stop(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self.process = None
+        if self.user_data_dir:
+            shutil.rmtree(self.user_data_dir, ignore_errors=True)
+            self.user_data_dir = None
+
+
+class BrowserServerPool:
+    """
+    A fixed number of browser servers with a health monitor that restarts
+    crashed or unresponsive servers on the same port.
+    """
+
+    def __init__(self, size, headless=True, check_interval=5, max_restarts=5):
+        executable = chromium_executable()
+        self.servers = [BrowserServer(executable, headless=headless) for _ in range(size)]
+        self.check_interval = check_interval
+        self.max_restarts = max_restarts
+        self._stop = threading.Event()
+        self._monitor = None
+
+    @property
+    def endpoints(self):
+        return [server.endpoint for server in self.servers]
+
+    def start(self):
+        for server in self.servers:
+            server.start()
+        self._monitor = threading.Thread(
+            target=self._watch,
+            name="browser-server-monitor",
+            daemon=True
+        )
+        self._monitor.start()
+
+    def _watch(self):
+        while not self._stop.wait(self.check_interval):
+            for server in self.servers:
+                if self._stop.is_set() or server.is_healthy():
+                    continue
+                if server.restarts >= self.max_restarts:
+                    logger.error(f"Browser server {server.endpoint} is down, giving up")
+                    continue
+                logger.warning(f"Browser server {server.endpoint} is down, restarting")
+                try:
+                    server.restart()
+                except RuntimeError as e:
+                    logger.error(str(e))
+
+    def stop(self):
+        self._stop.set()
+        if self._monitor is not None:
+            self._monitor.join()
+        for server in self.servers:
+            server.stop()
+
+
+class SharedBrowserConnection:
+    """
+    Browser connected to a shared server over CDP.
+    Reconnects when a new context is requested after the server restarted.
+    """
+
+    def __init__(self, browser_type, endpoint, timeout=60):
+        self.browser_type = browser_type
+        self.endpoint = endpoint
+        self.timeout = timeout
+        self._browser = None
+        self._connect()
+
+    def _connect(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                self._browser = self.browser_type.connect_over_cdp(self.endpoint)
+                return
+            except Exception as e:
+                if time.monotonic() > deadline:
+                    raise RuntimeError(
+                        f"Cannot connect to browser server {self.endpoint}: {e}"
+                    )
+                time.sleep(1)
+
+    def new_context(self, **kwargs):
+        if not self._browser.is_connected():
+            logger.warning(f"Reconnecting to browser server {self.endpoint}")
+            self._connect()
+        return self._browser.new_context(**kwargs)
+
+    def close(self):
+        """Disconnect; the shared browser process keeps running"""
+        if self._browser.is_connected():
+            self._browser.close()
+
+    def __getattr__(self, name):
+        return getattr(self._browser, name)
+
+
+def shared_browser_endpoint(worker_id):
+    """Returns the server endpoint for an xdist worker, or None if not shared"""
+    endpoints = [e for e in os.environ.get(ENDPOINTS_ENV, "").split(",") if e]
+    if not endpoints:
+        return None
+    index = int(worker_id[2:]) if worker_id.startswith("gw") else 0
+    return endpoints[index % len(endpoints)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shared browser servers for a host")
+    parser.add_argument("--servers", type=int, default=1)
+    parser.add_argument("--headed", action="store_true")
+    args = parser.parse_args(argv)
+    pool = BrowserServerPool(args.servers, headless=not args.headed)
+    pool.start()
+    print(f"export {ENDPOINTS_ENV}={','.join(pool.endpoints)}", flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pool.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,61 @@ class UIConstants:
     TIMEOUT_CALENDAR_INTERACTION = 1000
     TIMEOUT_MOUSE_MOVE = 1000
     TIMEOUT_ADDITIONAL_WAIT = 5000
+    TIMEOUT_API_REQUEST = 30000
+
+    # Number of pooled connections to the API opened during warm-up
+    API_POOL_SIZE = 4
+
+    # Seconds a cached admin token is reused before logging in again
+    ADMIN_TOKEN_TTL = 1800
+
+    # Host-wide API rate limits per endpoint class: (requests per second, burst)
+    RATE_LIMITER_FILE = "booking_rate_limiter.json"
+    RATE_LIMITS = {
+        "auth": (1, 2),
+        "read": (5, 10),
+        "write": (1, 3)
+    }
+
+    # Bytes read from the socket at a time when streaming API listings
+    STREAM_CHUNK_SIZE = 16384
+
+    # Seconds to reuse the result of a coalesced GET (0 - only share in-flight calls)
+    COALESCE_RESULT_TTL = 0.0
+
+    # Most recently used GETs whose ETag and parsed models are kept for conditional requests
+    ETAG_CACHE_SIZE = 64
+
+    # Adaptive timeouts learned from observed wait durations
+    ADAPTIVE_TIMEOUTS_FILE = ".adaptive_timeouts.json"
+    ADAPTIVE_TIMEOUT_PERCENTILE = 95
+    ADAPTIVE_TIMEOUT_MARGIN = 1.5
+    ADAPTIVE_TIMEOUT_MAX_SAMPLES = 200
+    ADAPTIVE_TIMEOUT_MIN_SAMPLES = 5
+    ADAPTIVE_TIMEOUT_FLOOR = 2000
+    ADAPTIVE_TIMEOUT_API_FLOOR = 5000
+    # Upper bounds above the timeout constants, so slower environments can learn longer waits
+    ADAPTIVE_TIMEOUT_CEILING = 30000
+    ADAPTIVE_TIMEOUT_API_CEILING = 60000
+
+    # Polling of eventually consistent API state: deadline (ms), first
+    # interval and its growth factor and limit (seconds)
+    WAIT_UNTIL_TIMEOUT = 10000
+    WAIT_UNTIL_INTERVAL = 0.05
+    WAIT_UNTIL_BACKOFF = 2.0
+    WAIT_UNTIL_MAX_INTERVAL = 1.0
+
+    # Structured API logging: characters of bodies kept, per-level sampling rates
+    LOG_BODY_LIMIT = 500
+    LOG_SAMPLING = {
+        "DEBUG": 1.0,
+        "INFO": 1.0
+    }
+    # Size-bounded log files: rotate at this size and keep this many files
+    LOG_ROTATION = "3 MB"
+    LOG_RETENTION = 10
+    API_LOG_FILE = "api_log.jsonl"
+    API_LOG_MAX_BYTES = 10 * 2 ** 20
 
     # Default booking dates
     DEFAULT_CHECKIN_DAYS = 7
@@ -0,0 +1,177 @@
+import heapq
+import json
+import os
+import statistics
+import time
+from collections import OrderedDict, defaultdict
+
+import pytest
+from loguru import logger
+from xdist.scheduler import LoadGroupScheduling
+
+
+def strip_group(nodeid):
+    """Remove the '@group' suffix xdist adds to grouped node ids"""
+    if nodeid.rfind("@") > nodeid.rfind("]"):
+        return nodeid.rsplit("@", 1)[0]
+    return nodeid
+
+
+class DurationHistory:
+    """Per-test durations of previous runs with estimates for unknown tests"""
+
+    def __init__(self, path, smoothing=0.5):
+        self.path = path
+        self.smoothing = smoothing
+        try:
+            with open(path) as file:
+                self.durations = json.load(file)
+        except (OSError, ValueError):
+            self.durations = {}
+        self._by_module = defaultdict(list)
+        for nodeid, duration in self.durations.items():
+            self._by_module[nodeid.split("::", 1)[0]].append(duration)
+        self._default = (
+            statistics.median(self.durations.values()) if self.durations else 1.0
+        )
+
+    def estimate(self, nodeid):
+        """
+        Known duration of a test, else the median of its module,
+        else the median of all known tests.
+        """
+        nodeid = strip_group(nodeid)
+        if nodeid in self.durations:
+            return self.durations[nodeid]
+        module_durations = self._by_module.get(nodeid.split("::", 1)[0])
+        if module_durations:
+            return statistics.median(module_durations)
+        return self._default
+
+    def update(self, measured):
+        """Blend the durations measured in this run into the history and save it"""
+        for nodeid, duration in measured.items():
+            previous = self.durations.get(nodeid)
+            self.durations[nodeid] = round(
+                duration if previous is None
+                else self.smoothing * duration + (1 - self.smoothing) * previous,
+                3
+            )
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(self.durations, file, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def predict_makespan(costs, workers):
+    """Makespan of assigning the costs longest first to the least-loaded worker"""
+    loads = [0.0] * max(workers, 1)
+    for cost in sorted(costs, reverse=True):
+        heapq.heapreplace(loads, loads[0] + cost)
+    return max(loads)
+
+
+class DurationScheduling(LoadGroupScheduling):
+    """
+    xdist scheduler assigning work units longest first (LPT): a worker gets
+    the longest remaining unit as soon as it runs its last pending test.
+    A unit is a single test or all tests of one xdist_group.
+    """
+
+    def __init__(self, config, log, history, on_schedule):
+        super().__init__(config, log)
+        self.history = history
+        self.on_schedule = on_schedule
+        self._ordered = False
+
+    def _unit_cost(self, work_unit):
+        return sum(self.history.estimate(nodeid) for nodeid in work_unit)
+
+    def _assign_work_unit(self, node):
+        if not self._ordered:
+            self._ordered = True
+            units = sorted(
+                self.workqueue.items(),
+                key=lambda item: -self._unit_cost(item[1])
+            )
+            self.workqueue = OrderedDict(units)
+            self.on_schedule(
+                predict_makespan([self._unit_cost(unit) for _, unit in units],
+                                 len(self.nodes))
+            )
+        super()._assign_work_unit(node)
+
+    def _reschedule(self, node):
+        if node.shutting_down:
+            return
+        if not self.workqueue:
+            node.shutdown()
+            return
+        # A worker holds its last test until it knows the next one,
+        # so new work is sent when a single test is left
+        if self._pending_of(self.assigned_work[node]) > 1:
+            return
+        self._assign_work_unit(node)
+
+
+class DurationSchedulingPlugin:
+    """
+    Records test durations and, under xdist, schedules the longest tests
+    first. Reports the predicted and actual makespan of the run.
+    The duration of a test is its setup, call and teardown time, since UI
+    tests spend much of it in fixtures (browser, context, page load).
+    Skipped tests (e.g. cached passes of the result cache, skipped in
+    setup) are not recorded, so they do not shrink the history.
+    """
+
+    def __init__(self, config, history_path):
+        self.config = config
+        self.is_worker = hasattr(config, "workerinput")
+        if self.is_worker:
+            # Grouped tests form one work unit: xdist adds the '@group'
+            # suffix to their node ids, as with --dist loadgroup
+            config.option.loadgroup = True
+        self.history = DurationHistory(history_path)
+        self.measured = defaultdict(float)
+        self._running = defaultdict(float)
+        self._skipped = set()
+        self.predicted = None
+        self.started = None
+        self.finished = None
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_xdist_make_scheduler(self, config, log):
+        return DurationScheduling(config, log, self.history, self._on_schedule)
+
+    def _on_schedule(self, predicted):
+        self.predicted = predicted
+        self.started = time.perf_counter()
+        logger.info(f"Longest-first schedule, predicted makespan {predicted:.1f}s")
+
+    def pytest_runtest_logreport(self, report):
+        if self.is_worker:
+            return
+        self.finished = time.perf_counter()
+        nodeid = strip_group(report.nodeid)
+        self._running[nodeid] += report.duration
+        if report.skipped:
+            self._skipped.add(nodeid)
+        if report.when == "teardown":
+            duration = self._running.pop(nodeid)
+            if nodeid in self._skipped:
+                self._skipped.discard(nodeid)
+            else:
+                self.measured[nodeid] += duration
+
+    def pytest_sessionfinish(self):
+        if not self.is_worker and self.measured:
+            self.history.update(self.measured)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.predicted is None or self.finished is None:
+            return
+        actual = self.finished - self.started
+        terminalreporter.write_sep("-", "duration scheduling")
+        terminalreporter.write_line(
+            f"Predicted makespan: {self.predicted:.1f}s, actual: {actual:.1f}s"
+        )
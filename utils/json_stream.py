@@ -0,0 +1,88 @@
+import codecs
+
+from utils.models import loads
+
+
+class _ArrayItemScanner:
+    """Tracks the JSON structure across chunks and cuts out array items"""
+
+    def __init__(self, key):
+        self.key = key
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.in_array = False
+        self.done = False
+        self.key_chars = []
+        self.last_key = None
+        self.item_parts = None
+        self.item_start = None
+
+    def feed(self, text):
+        """Yield the items completed by this piece of text"""
+        self.item_start = 0 if self.item_parts is not None else None
+        for index, char in enumerate(text):
+            if self.in_string:
+                self._string_char(char)
+            elif char == '"':
+                self.in_string = True
+                self.key_chars = []
+            elif char in "{[":
+                self._open(char, index)
+            elif char in "}]":
+                item = self._close(text, index)
+                if item is not None:
+                    yield loads(item)
+                if self.done:
+                    return
+        if self.item_parts is not None:
+            self.item_parts.append(text[self.item_start:])
+
+    def _string_char(self, char):
+        if self.escape:
+            self.escape = False
+        elif char == "\\":
+            self.escape = True
+        elif char == '"':
+            self.in_string = False
+            if self.depth == 1:
+                self.last_key = "".join(self.key_chars)
+        elif self.depth == 1:
+            self.key_chars.append(char)
+
+    def _open(self, char, index):
+        # Only object items are cut out; nested arrays are skipped whole
+        if self.in_array and self.depth == 2 and char == "{":
+            self.item_parts, self.item_start = [], index
+        self.depth += 1
+        if self.depth == 2 and char == "[" and self.last_key == self.key:
+            self.in_array = True
+
+    def _close(self, text, index):
+        """Returns the text of the item closed at index, if any"""
+        self.depth -= 1
+        if not self.in_array:
+            return None
+        if self.depth == 1:
+            self.done = True
+        elif self.depth == 2 and self.item_parts is not None:
+            self.item_parts.append(text[self.item_start:index + 1])
+            item = "".join(self.item_parts)
+            self.item_parts = self.item_start = None
+            return item
+        return None
+
+
+def iter_array_items(chunks, key):
+    """
+    Incrementally parse a JSON document arriving in byte chunks and yield
+    the object items of the array under a top-level key, e.g. the rooms of
+    {"rooms": [{...}, {...}]}, one by one. Only the item being parsed is
+    kept in memory. Scalar and array items of the array are skipped.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    scanner = _ArrayItemScanner(key)
+    for chunk in chunks:
+        yield from scanner.feed(decoder.decode(chunk))
+        if scanner.done:
+            return
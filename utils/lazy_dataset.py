@@ -0,0 +1,105 @@
+import json
+import os
+from pathlib import Path
+
+from loguru import logger
+
+
+class LazyCase:
+    """A dataset case known only by its id and file offset until it is loaded"""
+
+    __slots__ = ("path", "offset", "case_id", "tags")
+
+    def __init__(self, path, offset, case_id, tags):
+        self.path = path
+        self.offset = offset
+        self.case_id = case_id
+        self.tags = tags
+
+    def load(self):
+        """Read and parse the case payload from its offset in the dataset"""
+        with open(self.path, "rb") as file:
+            file.seek(self.offset)
+            return json.loads(file.readline())
+
+    def __repr__(self):
+        return f"LazyCase({self.case_id})"
+
+
+class DatasetIndex:
+    """
+    Offset index of a JSON lines case dataset. Every line is a case with
+    an "id" and optional "tags". The index is stored next to the dataset
+    and rebuilt only when the dataset changes, so parallel workers and
+    later runs collect cases without parsing the dataset again.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.index_path = self.path.with_name(f".{self.path.name}.index.json")
+
+    def _signature(self):
+        stat = self.path.stat()
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def _build(self):
+        entries = []
+        offset = 0
+        with open(self.path, "rb") as file:
+            for line_number, line in enumerate(file, start=1):
+                if line.strip():
+                    record = json.loads(line)
+                    case_id = record.get("id") or f"{self.path.stem}-{line_number}"
+                    entries.append([offset, case_id, record.get("tags", [])])
+                offset += len(line)
+        return entries
+
+    def entries(self):
+        """Returns [offset, id, tags] for every case"""
+        signature = self._signature()
+        try:
+            with open(self.index_path) as file:
+                stored = json.load(file)
+            if stored["signature"] == signature:
+                return stored["entries"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        entries = self._build()
+        tmp_path = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "w") as file:
+                json.dump({"signature": signature, "entries": entries}, file)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            logger.info(f"Failed to store dataset index {self.index_path}: {e}")
+        return entries
+
+    def cases(self, tags=None):
+        """Returns the cases having any of the tags (all cases if no tags)"""
+        wanted = set(tags or [])
+        return [
+            LazyCase(str(self.path), offset, case_id, case_tags)
+            for offset, case_id, case_tags in self.entries()
+            if not wanted or wanted.intersection(case_tags)
+        ]
+
+
+def parametrize_from_dataset(metafunc, root, command_line_tags=None):
+    """
+    Parametrize the 'case' argument of tests marked with
+    @pytest.mark.dataset(path, tags=[...]) with lazy cases of the dataset.
+    The payload of a case is loaded by the 'case' fixture when the test runs.
+    """
+    marker = metafunc.definition.get_closest_marker("dataset")
+    if marker is None or "case" not in metafunc.fixturenames:
+        return
+    path = Path(root) / marker.args[0]
+    cases = DatasetIndex(path).cases(marker.kwargs.get("tags"))
+    if command_line_tags:
+        cases = [case for case in cases if set(command_line_tags) & set(case.tags)]
+    metafunc.parametrize(
+        "case",
+        cases,
+        ids=[case.case_id for case in cases],
+        indirect=True
+    )
@@ -0,0 +1,229 @@
+import gc
+import json
+import os
+import tracemalloc
+from collections import Counter
+
+import pytest
+
+
+def current_rss():
+    """Returns the resident set size of this process in bytes, or None"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _proc_children():
+    """Maps process ids to their child process ids, read from /proc"""
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as file:
+                # The command name may contain spaces; fields follow its ')'
+                parent = int(file.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(parent, []).append(int(entry))
+    return children
+
+
+def _proc_tree_rss():
+    """Process tree RSS in bytes from /proc, or None"""
+    try:
+        page_size = os.sysconf("SC_PAGE_SIZE")
+        children = _proc_children()
+    except (OSError, ValueError, AttributeError):
+        return None
+    total = 0
+    pending = [os.getpid()]
+    while pending:
+        pid = pending.pop()
+        pending.extend(children.get(pid, ()))
+        try:
+            with open(f"/proc/{pid}/statm") as file:
+                total += int(file.read().split()[1]) * page_size
+        except (OSError, ValueError):
+            pass
+    return total
+
+
+def process_tree_rss():
+    """
+    Returns the resident set size of this process and all its descendants
+    (e.g. the Playwright driver and browser processes) in bytes, or None
+    """
+    try:
+        import psutil
+    except ImportError:
+        return _proc_tree_rss()
+    process = psutil.Process()
+    total = process.memory_info().rss
+    for child in process.children(recursive=True):
+        try:
+            total += child.memory_info().rss
+        except psutil.Error:
+            pass
+    return total
+
+
+class MemoryTrackingPlugin:
+    """
+    Pytest plugin snapshotting Python allocations and process RSS around
+    each test. The retained memory and the top growing allocation sites of
+    a test are attached to its teardown report, so the controller can
+    summarize them also when tests run on xdist workers. The session's
+    top allocation sites come from snapshots taken at session start and
+    end in every test process (sent to the controller in workeroutput).
+    """
+
+    IGNORED_FILES = (
+        tracemalloc.__file__,
+        "<frozen importlib._bootstrap>",
+        "<frozen importlib._bootstrap_external>",
+        "<unknown>"
+    )
+
+    def __init__(self, config, threshold_kb, top, report_path):
+        self.config = config
+        self.threshold = threshold_kb * 1024
+        self.top = top
+        self.report_path = report_path
+        self.is_worker = hasattr(config, "workerinput")
+        self.worker = getattr(config, "workerinput", {}).get("workerid", "main")
+        self._filters = [
+            tracemalloc.Filter(False, file_name) for file_name in self.IGNORED_FILES
+        ]
+        self._before = {}
+        self._session_start = None
+        self.tests = {}
+        self.sites = {}
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def _snapshot(self):
+        gc.collect()
+        return tracemalloc.take_snapshot().filter_traces(self._filters)
+
+    def pytest_sessionstart(self):
+        self._session_start = self._snapshot()
+
+    def _session_sites(self):
+        """Allocation sites grown since session start: [site, size_diff, count_diff]"""
+        stats = self._snapshot().compare_to(self._session_start, "lineno")
+        return [
+            [str(stat.traceback[0]), stat.size_diff, stat.count_diff]
+            for stat in stats if stat.size_diff > 0
+        ]
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        sites = getattr(node, "workeroutput", {}).get("memory_sites")
+        if sites is not None:
+            self.sites[node.workerinput["workerid"]] = sites
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item):
+        self._before[item.nodeid] = (self._snapshot(), current_rss())
+        yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(self, item):
+        yield
+        before = self._before.pop(item.nodeid, None)
+        if before is None:
+            return
+        snapshot, rss_before = before
+        stats = self._snapshot().compare_to(snapshot, "lineno")
+        rss_after = current_rss()
+        growing = [stat for stat in stats if stat.size_diff > 0]
+        item.user_properties.append(("memory", {
+            "worker": self.worker,
+            "retained": sum(stat.size_diff for stat in stats),
+            "rss_before": rss_before,
+            "rss_after": rss_after,
+            "top": [
+                [str(stat.traceback[0]), stat.size_diff, stat.count_diff]
+                for stat in growing[:self.top]
+            ]
+        }))
+
+    def pytest_runtest_logreport(self, report):
+        if report.when != "teardown":
+            return
+        for name, value in report.user_properties:
+            if name == "memory":
+                self.tests[report.nodeid] = value
+
+    def session_summary(self):
+        """Summarize allocation growth and RSS of the whole session"""
+        sites = Counter()
+        for worker_sites in self.sites.values():
+            for site, size_diff, _ in worker_sites:
+                sites[site] += size_diff
+        rss = {}
+        for result in self.tests.values():
+            worker_rss = rss.setdefault(result["worker"], {})
+            worker_rss.setdefault("start", result["rss_before"])
+            worker_rss["end"] = result["rss_after"]
+        return {
+            "retained": sum(result["retained"] for result in self.tests.values()),
+            "top": sites.most_common(self.top),
+            "rss": rss
+        }
+
+    def flagged_tests(self):
+        return {
+            nodeid: result for nodeid, result in self.tests.items()
+            if result["retained"] > self.threshold
+        }
+
+    def pytest_sessionfinish(self):
+        if self.is_worker:
+            self.config.workeroutput["memory_sites"] = self._session_sites()
+            return
+        if any(result["worker"] == self.worker for result in self.tests.values()):
+            # Tests ran in this process (no xdist)
+            self.sites[self.worker] = self._session_sites()
+        if not self.tests:
+            return
+        with open(self.report_path, "w") as file:
+            json.dump({
+                "tests": self.tests,
+                "session": self.session_summary(),
+                "flagged": sorted(self.flagged_tests())
+            }, file, indent=2)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.is_worker or not self.tests:
+            return
+        summary = self.session_summary()
+        terminalreporter.write_sep("-", "memory tracking")
+        terminalreporter.write_line(
+            f"Retained by {len(self.tests)} tests: {summary['retained'] / 1024:.1f} KiB"
+        )
+        for worker, rss in sorted(summary["rss"].items()):
+            if rss["start"] and rss["end"]:
+                terminalreporter.write_line(
+                    f"RSS {worker}: {rss['start'] / 2 ** 20:.1f} MiB -> "
+                    f"{rss['end'] / 2 ** 20:.1f} MiB"
+                )
+        terminalreporter.write_line("Top growing allocation sites (session start to end):")
+        for site, size_diff in summary["top"]:
+            terminalreporter.write_line(f"  {size_diff / 1024:+10.1f} KiB  {site}")
+        for nodeid, result in sorted(self.flagged_tests().items()):
+            terminalreporter.write_line(
+                f"LEAK? {nodeid} retained {result['retained'] / 1024:.1f} KiB "
+                f"(threshold {self.threshold / 1024:.0f} KiB)",
+                yellow=True
+            )
+        terminalreporter.write_line(f"Memory report written to {self.report_path}")
@@ -0,0 +1,163 @@
+import json
+import sys
+from dataclasses import dataclass
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data):
+    """Parse JSON (bytes or str) with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@dataclass(frozen=True, slots=True, repr=False)
+class Room:
+    """
+    A room of the booking API, with 'roomid'/'id' normalized to room_id.
+    Immutable and hashable, so rooms can be shared, put in sets and used as keys.
+    """
+
+    room_id: int
+    name: str
+    type: str = None
+    accessible: bool = False
+    description: str = None
+    features: tuple = ()
+    price: int = None
+    image: str = None
+
+    def __post_init__(self):
+        # Repeated values share one string object in large catalogs
+        object.__setattr__(self, "type", _intern(self.type))
+        object.__setattr__(
+            self, "features", tuple(_intern(feature) for feature in self.features or ())
+        )
+
+    @property
+    def id(self):
+        return self.room_id
+
+    @staticmethod
+    def id_from(data):
+        """Room id of an API payload, whichever id key it uses"""
+        room_id = data.get("roomid")
+        return room_id if room_id is not None else data.get("id")
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            cls.id_from(data),
+            data.get("roomName"),
+            data.get("type"),
+            data.get("accessible", False),
+            data.get("description"),
+            data.get("features"),
+            data.get("roomPrice"),
+            data.get("image")
+        )
+
+    def to_dict(self):
+        """Room in the shape of the API payload"""
+        return {
+            "roomid": self.room_id,
+            "roomName": self.name,
+            "type": self.type,
+            "accessible": self.accessible,
+            "description": self.description,
+            "features": list(self.features),
+            "roomPrice": self.price,
+            "image": self.image
+        }
+
+    def __repr__(self):
+        return f"Room({self.room_id}, {self.name!r}, price={self.price})"
+
+
+@dataclass(frozen=True, slots=True, repr=False)
+class Booking:
+    """
+    A booking of the booking API, with 'bookingid'/'id' normalized to booking_id.
+    Immutable and hashable like Room.
+    """
+
+    booking_id: int
+    room_id: int
+    firstname: str = None
+    lastname: str = None
+    email: str = None
+    phone: str = None
+    deposit_paid: bool = False
+    checkin: str = None
+    checkout: str = None
+
+    @property
+    def id(self):
+        return self.booking_id
+
+    @staticmethod
+    def id_from(data):
+        """Booking id of an API payload, whichever id key it uses"""
+        booking_id = data.get("bookingid")
+        return booking_id if booking_id is not None else data.get("id")
+
+    @classmethod
+    def from_dict(cls, data):
+        """Also accepts the {"bookingid": ..., "booking": {...}} creation payload"""
+        fields = {**data.get("booking", {}), **data}
+        dates = fields.get("bookingdates") or {}
+        return cls(
+            cls.id_from(fields),
+            Room.id_from(fields),
+            fields.get("firstname"),
+            fields.get("lastname"),
+            fields.get("email"),
+            fields.get("phone"),
+            fields.get("depositpaid", False),
+            dates.get("checkin"),
+            dates.get("checkout")
+        )
+
+    def to_dict(self):
+        """Booking in the shape of the API payload"""
+        return {
+            "bookingid": self.booking_id,
+            "roomid": self.room_id,
+            "firstname": self.firstname,
+            "lastname": self.lastname,
+            "email": self.email,
+            "phone": self.phone,
+            "depositpaid": self.deposit_paid,
+            "bookingdates": {"checkin": self.checkin, "checkout": self.checkout}
+        }
+
+    def __repr__(self):
+        return f"Booking({self.booking_id}, room={self.room_id}, {self.checkin} - {self.checkout})"
+
+
+class ModelCollection(list):
+    """List of models with lookups by id and by field values"""
+
+    def by_id(self, model_id):
+        return next((model for model in self if model.id == model_id), None)
+
+    def first(self, **fields):
+        """First model whose attributes equal all given values, or None"""
+        return next(
+            (model for model in self
+             if all(getattr(model, name) == value for name, value in fields.items())),
+            None
+        )
+
+    @classmethod
+    def of(cls, model, items):
+        """Collection of models built from API payload dicts"""
+        return cls(model.from_dict(item) for item in items)
@@ -0,0 +1,214 @@
+import re
+import sys
+import threading
+import time
+import zlib
+from collections import Counter
+from contextlib import contextmanager
+from html import escape
+from pathlib import Path
+
+import pytest
+from loguru import logger
+
+
+class SamplingProfiler:
+    """Samples the stack of one thread from a background thread"""
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.stacks = Counter()
+        self._thread_id = None
+        self._root = None
+        self._stop = threading.Event()
+        self._sampler = None
+
+    def start(self, thread_id=None, root=None):
+        """Start sampling the given thread (default: the calling thread)"""
+        self._thread_id = thread_id or threading.get_ident()
+        self._root = root
+        self._stop.clear()
+        self._sampler = threading.Thread(
+            target=self._run,
+            name="profiler-sampler",
+            daemon=True
+        )
+        self._sampler.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self.frame_label(frame))
+                frame = frame.f_back
+            if self._root:
+                stack.append(self._root)
+            self.stacks[";".join(reversed(stack))] += 1
+
+    @staticmethod
+    def frame_label(frame):
+        code = frame.f_code
+        name = getattr(code, "co_qualname", code.co_name)
+        return f"{Path(code.co_filename).stem}.{name}".replace(";", ":")
+
+
+def trim_common_prefix(stacks, root):
+    """
+    Drop the frames shared by all stacks (the pytest runner machinery),
+    keeping the root label and at least the innermost frame.
+    """
+    frames = [stack.split(";")[1:] for stack in stacks]
+    if not frames:
+        return stacks
+    common = 0
+    shortest = min(len(frame_list) for frame_list in frames)
+    while (common < shortest - 1
+           and len({frame_list[common] for frame_list in frames}) == 1):
+        common += 1
+    trimmed = Counter()
+    for frame_list, count in zip(frames, stacks.values()):
+        trimmed[";".join([root] + frame_list[common:])] += count
+    return trimmed
+
+
+def write_collapsed(stacks, path):
+    """Write stacks in the collapsed format used by flamegraph tools"""
+    with open(path, "w") as file:
+        for stack, count in sorted(stacks.items()):
+            file.write(f"{stack} {count}\n")
+
+
+def read_collapsed(path):
+    stacks = Counter()
+    with open(path) as file:
+        for line in file:
+            stack, _, count = line.rstrip("\n").rpartition(" ")
+            if stack:
+                stacks[stack] += int(count)
+    return stacks
+
+
+def write_flamegraph(stacks, path, title="Test session flamegraph"):
+    """Render collapsed stacks as a standalone SVG flamegraph"""
+    root = {"children": {}, "count": 0}
+    for stack, count in stacks.items():
+        node = root
+        node["count"] += count
+        for name in stack.split(";"):
+            node = node["children"].setdefault(name, {"children": {}, "count": 0})
+            node["count"] += count
+
+    width, row_height, top = 1200, 16, 30
+    rects = []
+
+    def place(node, x, depth):
+        for name, child in sorted(node["children"].items()):
+            child_width = width * child["count"] / root["count"]
+            if child_width >= 0.5:
+                rects.append((name, child["count"], x, depth, child_width))
+                place(child, x, depth + 1)
+            x += child_width
+
+    if root["count"]:
+        place(root, 0, 0)
+    depth = max((rect[3] for rect in rects), default=0) + 1
+    height = top + depth * row_height
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" '
+        f'height="{height}" font-family="monospace" font-size="11">',
+        f'<text x="{width / 2}" y="18" text-anchor="middle">{escape(title)}</text>'
+    ]
+    for name, count, x, level, rect_width in rects:
+        y = height - (level + 1) * row_height
+        hue = 20 + zlib.crc32(name.encode()) % 40
+        percent = 100 * count / root["count"]
+        label = escape(name[:int(rect_width / 7)]) if rect_width > 21 else ""
+        parts.append(
+            f'<g><title>{escape(name)} ({count} samples, {percent:.2f}%)</title>'
+            f'<rect x="{x:.1f}" y="{y}" width="{rect_width:.1f}" '
+            f'height="{row_height - 1}" fill="hsl({hue}, 90%, 60%)"/>'
+            f'<text x="{x + 2:.1f}" y="{y + 11}">{label}</text></g>'
+        )
+    parts.append("</svg>")
+    Path(path).write_text("\n".join(parts))
+
+
+class ProfilingPlugin:
+    """
+    Pytest plugin sampling the stack of each test's setup, call and teardown.
+    Writes one collapsed-stack file per test and a merged session flamegraph.
+    """
+
+    def __init__(self, config, output_dir, interval):
+        self.config = config
+        self.output_dir = Path(output_dir)
+        self.interval = interval
+        self.is_worker = hasattr(config, "workerinput")
+        self._stacks = {}
+        if not self.is_worker:
+            # Workers are started after the controller is configured,
+            # so results of the previous run are removed only once
+            for path in self.output_dir.glob("*.collapsed"):
+                path.unlink()
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+    @contextmanager
+    def _sampling(self, item, phase):
+        profiler = SamplingProfiler(self.interval)
+        profiler.start(root=phase)
+        try:
+            yield
+        finally:
+            profiler.stop()
+            self._stacks.setdefault(item.nodeid, Counter()).update(
+                trim_common_prefix(profiler.stacks, phase)
+            )
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item):
+        with self._sampling(item, "setup"):
+            yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        with self._sampling(item, "call"):
+            yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(self, item):
+        with self._sampling(item, "teardown"):
+            yield
+
+    def pytest_runtest_logfinish(self, nodeid):
+        stacks = self._stacks.pop(nodeid, None)
+        if stacks:
+            file_name = re.sub(r"[^\w.-]+", "_", nodeid).strip("_")
+            write_collapsed(stacks, self.output_dir / f"{file_name}.collapsed")
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self):
+        if self.is_worker:
+            return
+        merged = Counter()
+        for path in sorted(self.output_dir.glob("*.collapsed")):
+            test_name = path.stem.replace(";", ":")
+            for stack, count in read_collapsed(path).items():
+                merged[f"{test_name};{stack}"] += count
+        if not merged:
+            return
+        started = time.perf_counter()
+        write_collapsed(merged, self.output_dir / "session.folded")
+        write_flamegraph(merged, self.output_dir / "flamegraph.svg")
+        logger.info(
+            f"Profiles written to {self.output_dir} "
+            f"(flamegraph rendered in {time.perf_counter() - started:.2f}s)"
+        )
@@ -0,0 +1,103 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from utils.constants_ui import UIConstants
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class SharedRateLimiter:
+    """
+    Token bucket shared by all processes of the host through a file-locked
+    state file, with a separate budget per endpoint class.
+    A request that finds the bucket empty reserves the next token and sleeps
+    until it is due, so concurrent workers are served in arrival order.
+    """
+
+    def __init__(self, budgets=None, state_path=None):
+        # Budget per endpoint class: (requests per second, burst)
+        self.budgets = budgets or UIConstants.RATE_LIMITS
+        self.state_path = state_path or os.path.join(
+            tempfile.gettempdir(), UIConstants.RATE_LIMITER_FILE
+        )
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    @staticmethod
+    def endpoint_class(method, url):
+        """Returns the budget class of a request: auth, read or write"""
+        if "/api/auth/" in url:
+            return "auth"
+        return "read" if method.upper() in ("GET", "HEAD") else "write"
+
+    @contextmanager
+    def _locked_state(self):
+        with self._lock, open(self.state_path, "a+") as file:
+            if fcntl:
+                fcntl.flock(file, fcntl.LOCK_EX)
+            else:
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                file.seek(0)
+                try:
+                    state = json.loads(file.read() or "{}")
+                except ValueError:
+                    state = {}
+                yield state
+                file.seek(0)
+                file.truncate()
+                file.write(json.dumps(state))
+                file.flush()
+            finally:
+                if fcntl:
+                    fcntl.flock(file, fcntl.LOCK_UN)
+                else:
+                    file.seek(0)
+                    msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def reserve(self, endpoint_class):
+        """Take a token from the bucket and return how long to wait for it (s)"""
+        rate, burst = self.budgets[endpoint_class]
+        now = time.time()
+        with self._locked_state() as state:
+            tokens, updated = state.get(endpoint_class, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate) - 1
+            state[endpoint_class] = (tokens, now)
+        return max(-tokens / rate, 0.0)
+
+    def acquire(self, endpoint_class):
+        """Block until a request of the endpoint class may be sent"""
+        wait = self.reserve(endpoint_class)
+        if wait:
+            time.sleep(wait)
+        with self._lock:
+            stats = self._stats.setdefault(
+                endpoint_class,
+                {"requests": 0, "throttled": 0, "total_wait": 0.0, "max_wait": 0.0}
+            )
+            stats["requests"] += 1
+            stats["throttled"] += wait > 0
+            stats["total_wait"] += wait
+            stats["max_wait"] = max(stats["max_wait"], wait)
+        return wait
+
+    def stats(self):
+        """Wait-time metrics of this process per endpoint class"""
+        with self._lock:
+            return {
+                endpoint_class: {**stats, "total_wait": round(stats["total_wait"], 3),
+                                 "max_wait": round(stats["max_wait"], 3)}
+                for endpoint_class, stats in self._stats.items()
+            }
+
+
+rate_limiter = SharedRateLimiter()
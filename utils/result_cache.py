@@ -0,0 +1,250 @@
+import ast
+import hashlib
+import inspect
+import json
+import os
+import platform
+import types
+from pathlib import Path
+
+import pytest
+from loguru import logger
+
+ENVIRONMENT_ENV = "RESULT_CACHE_ENVIRONMENT"
+
+
+def _digest(*parts):
+    sha = hashlib.sha256()
+    for part in parts:
+        sha.update(part if isinstance(part, bytes) else str(part).encode())
+        sha.update(b"\0")
+    return sha.hexdigest()
+
+
+def environment_fingerprint(utils):
+    """
+    Hash of the target environment: Python and package versions, the base
+    page and the room list. Returns None when the target cannot be read,
+    so that cached results are not reused against an unknown environment.
+    """
+    from importlib.metadata import PackageNotFoundError, version
+    versions = []
+    for package in ("pytest", "playwright", "pytest-playwright"):
+        try:
+            versions.append(f"{package}={version(package)}")
+        except PackageNotFoundError:
+            pass
+    try:
+        base_page = utils.transport.request("GET", utils.base_url, timeout=10)
+        rooms = utils.transport.request("GET", f"{utils.base_url}/api/room/", timeout=10)
+    except Exception as e:
+        logger.info(f"Result cache: environment not reachable ({e}), rerunning all tests")
+        return None
+    return _digest(
+        platform.python_version(), *versions, utils.transport.name, utils.base_url,
+        base_page.status_code, base_page.content, rooms.status_code, rooms.content
+    )
+
+
+class DependencyIndex:
+    """
+    Finds the local source files a test depends on: the modules of the
+    globals used by the test and its fixtures, plus their local imports
+    (recursively). Files outside the root directory are ignored.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root).resolve()
+        self._imports = {}
+        self._hashes = {}
+
+    def is_local(self, path):
+        try:
+            Path(path).resolve().relative_to(self.root)
+        except (TypeError, ValueError):
+            return False
+        return "site-packages" not in str(path)
+
+    def _module_file(self, dotted):
+        """Local file of a dotted module name, if any"""
+        base = self.root.joinpath(*dotted.split("."))
+        for candidate in (base.with_suffix(".py"), base / "__init__.py"):
+            if candidate.is_file():
+                return candidate.resolve()
+        return None
+
+    def _direct_imports(self, path):
+        files = set()
+        for node in ast.walk(ast.parse(path.read_bytes())):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names = [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+            else:
+                continue
+            files.update(filter(None, map(self._module_file, names)))
+        return files
+
+    def imports(self, path):
+        """The file and all local files it imports, recursively"""
+        path = Path(path).resolve()
+        if path not in self._imports:
+            self._imports[path] = {path}
+            for imported in self._direct_imports(path):
+                self._imports[path] |= self.imports(imported)
+        return self._imports[path]
+
+    def file_hash(self, path):
+        if path not in self._hashes:
+            self._hashes[path] = _digest(path.read_bytes())
+        return self._hashes[path]
+
+    def function_files(self, function):
+        """Local files defining the globals a function uses"""
+        function = inspect.unwrap(function)
+        files = set()
+        codes = [function.__code__]
+        while codes:
+            code = codes.pop()
+            codes.extend(const for const in code.co_consts if isinstance(const, types.CodeType))
+            for name in code.co_names:
+                value = function.__globals__.get(name)
+                module = value if isinstance(value, types.ModuleType) else inspect.getmodule(value)
+                source = getattr(module, "__file__", None)
+                if source and self.is_local(source):
+                    files |= self.imports(source)
+        return files
+
+
+class ResultCachePlugin:
+    """
+    Skips tests whose inputs did not change since they last passed. The
+    fingerprint of a test covers its source, the source of its fixtures,
+    the local page-object and utils modules they use (with their imports),
+    the conftest files, test_data.json, dataset files and a fingerprint
+    of the target environment. Tests sharing an xdist_group run together
+    when any of them has to run. Fingerprints reach the controller through
+    user_properties, so results are recorded also under xdist.
+    """
+
+    def __init__(self, config, cache_path, force_rerun):
+        self.config = config
+        self.cache_path = Path(cache_path)
+        self.force_rerun = force_rerun
+        self.is_worker = hasattr(config, "workerinput")
+        self.index = DependencyIndex(config.rootpath)
+        try:
+            self.passed = json.loads(self.cache_path.read_text())
+        except (OSError, ValueError):
+            self.passed = {}
+        self.environment = os.environ.get(ENVIRONMENT_ENV)
+        self.recorded = {}
+
+    def set_environment(self, fingerprint):
+        """Environment fingerprint of this run, shared with xdist workers"""
+        self.environment = fingerprint or ""
+        os.environ[ENVIRONMENT_ENV] = self.environment
+
+    def _shared_files(self, item):
+        """Conftest files of the test, test data, pytest.ini and dataset files"""
+        root = self.config.rootpath
+        files = {root / "test_data.json", root / "pytest.ini"}
+        for directory in item.path.parents:
+            if self.index.is_local(directory):
+                files.add(directory / "conftest.py")
+        for marker in item.iter_markers("dataset"):
+            files.add(root / marker.args[0])
+        return {path.resolve() for path in files if path.is_file()}
+
+    def _local_fixtures(self, item):
+        for name in sorted(item.fixturenames):
+            for fixturedef in item._fixtureinfo.name2fixturedefs.get(name, ()):
+                try:
+                    source_file = inspect.getsourcefile(fixturedef.func)
+                except TypeError:
+                    continue
+                if self.index.is_local(source_file):
+                    yield fixturedef.func
+
+    def fingerprint(self, item):
+        """Hash of everything the outcome of a test depends on"""
+        files = self.index.function_files(item.function) | self.index.imports(item.path)
+        sources = [inspect.getsource(item.function)]
+        for fixture in self._local_fixtures(item):
+            sources.append(inspect.getsource(fixture))
+            files |= self.index.function_files(fixture)
+        files |= self._shared_files(item)
+        return _digest(
+            self._key(item), self.environment, *sources,
+            *(f"{path}:{self.index.file_hash(path)}" for path in sorted(files))
+        )
+
+    @staticmethod
+    def _group(item):
+        marker = item.get_closest_marker("xdist_group")
+        if marker is None:
+            return None
+        return marker.args[0] if marker.args else marker.kwargs.get("name", "default")
+
+    def _key(self, item):
+        """Node id without the '@group' suffix added for xdist scheduling"""
+        suffix = f"@{self._group(item)}"
+        if self._group(item) is not None and item.nodeid.endswith(suffix):
+            return item.nodeid[:-len(suffix)]
+        return item.nodeid
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, config, items):
+        entries = {item: (self._key(item), self.fingerprint(item)) for item in items}
+        must_run = {
+            self._group(item) or key for item, (key, fingerprint) in entries.items()
+            if self.force_rerun or not self.environment
+            or self.passed.get(key) != fingerprint
+        }
+        for item, (key, fingerprint) in entries.items():
+            item.user_properties.append(("fingerprint", [key, fingerprint]))
+            if (self._group(item) or key) not in must_run:
+                item.add_marker(pytest.mark.skip(
+                    reason="cached pass: test, dependencies and environment unchanged"
+                ))
+
+    def pytest_runtest_logreport(self, report):
+        if self.is_worker:
+            return
+        entry = dict(report.user_properties).get("fingerprint")
+        if entry is None:
+            return
+        key, fingerprint = entry
+        if report.failed:
+            self.recorded[key] = None
+        elif report.when == "call" and report.passed:
+            self.recorded.setdefault(key, fingerprint)
+
+    def pytest_sessionfinish(self):
+        if self.is_worker or not self.environment:
+            return
+        for key, fingerprint in self.recorded.items():
+            if fingerprint is None:
+                self.passed.pop(key, None)
+            else:
+                self.passed[key] = fingerprint
+        tmp_path = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(self.passed, indent=1, sort_keys=True))
+        os.replace(tmp_path, self.cache_path)
+
+    def pytest_unconfigure(self):
+        if not self.is_worker:
+            os.environ.pop(ENVIRONMENT_ENV, None)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.is_worker:
+            return
+        skipped = terminalreporter.stats.get("skipped", [])
+        cached = sum("cached pass" in str(report.longrepr) for report in skipped)
+        terminalreporter.write_sep("-", "result cache")
+        if not self.environment:
+            terminalreporter.write_line("Environment unknown: all tests were run")
+        terminalreporter.write_line(
+            f"{cached} tests skipped with a cached pass, "
+            f"{sum(fp is not None for fp in self.recorded.values())} passes recorded"
+        )
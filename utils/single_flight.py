@@ -0,0 +1,93 @@
+import copy
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+class _Call:
+    __slots__ = ("event", "value", "error", "generation", "resource")
+
+    def __init__(self, generation, resource):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+        self.generation = generation
+        self.resource = resource
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical idempotent calls: the first caller runs
+    the call, callers arriving while it is in flight wait and share its
+    result. Results can be kept for a short window (result_ttl seconds).
+    When a resource is invalidated by a mutating request, its stored
+    results are dropped and calls in flight at that moment are detached:
+    later callers start a new call instead of joining one that may have
+    read the old state. Every caller gets its own copy of the result.
+    """
+
+    def __init__(self, result_ttl=0.0):
+        self.result_ttl = result_ttl
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._results = {}
+        self._generations = {}
+        self.coalesced = 0
+
+    @staticmethod
+    def resource(url):
+        """Returns the resource collection of a URL, e.g. '/api/room'"""
+        return "/".join(urlsplit(url).path.split("/")[:3])
+
+    def do(self, url, key, func, share=copy.deepcopy):
+        """
+        Run func once for all concurrent callers with the same key.
+        share(value) makes the copy of the result returned to each caller.
+        """
+        resource = self.resource(url)
+        with self._lock:
+            cached = self._results.get(key)
+            if cached and cached[0] > time.monotonic():
+                self.coalesced += 1
+                return share(cached[1])
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call(self._generations.get(resource, 0), resource)
+                self._calls[key] = call
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return share(call.value)
+
+        try:
+            call.value = func()
+            return share(call.value)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                # An invalidation may have detached the call already
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+                fresh = call.generation == self._generations.get(resource, 0)
+                if self.result_ttl and call.error is None and fresh:
+                    self._results[key] = (
+                        time.monotonic() + self.result_ttl, call.value, resource
+                    )
+            call.event.set()
+
+    def invalidate(self, url):
+        """Drop stored and in-flight results of the resource of a URL"""
+        resource = self.resource(url)
+        with self._lock:
+            self._generations[resource] = self._generations.get(resource, 0) + 1
+            for key in [k for k, v in self._results.items() if v[2] == resource]:
+                del self._results[key]
+            for key in [k for k, call in self._calls.items() if call.resource == resource]:
+                del self._calls[key]
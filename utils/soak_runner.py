@@ -0,0 +1,268 @@
+"""
+Endurance (soak) runner looping the booking flows for hours.
+
+Usage:
+    python -m utils.soak_runner --duration-hours 8 --flows api,ui
+"""
+import argparse
+import gc
+import json
+import math
+import time
+import uuid
+from collections import deque
+
+from loguru import logger
+
+from page_object.base_page import BasePage
+from page_object.booking_page import BookingComponent
+from page_object.home_page import HomePage
+from utils.memory_tracking import current_rss, process_tree_rss
+from utils.utils_api import BookingUtils
+
+
+class RollingMetrics:
+    """Throughput, latency and error metrics over a sliding time window"""
+
+    def __init__(self, window_seconds):
+        self.window_seconds = window_seconds
+        self.samples = deque()
+
+    def record(self, flow, duration, ok):
+        self.samples.append((time.monotonic(), flow, duration, ok))
+
+    def snapshot(self):
+        """Returns metrics per flow for the samples inside the window"""
+        now = time.monotonic()
+        while self.samples and self.samples[0][0] < now - self.window_seconds:
+            self.samples.popleft()
+        flows = {}
+        for _, flow, duration, ok in self.samples:
+            flows.setdefault(flow, []).append((duration, ok))
+        metrics = {}
+        for flow, results in flows.items():
+            durations = sorted(duration for duration, _ in results)
+            errors = sum(not ok for _, ok in results)
+            metrics[flow] = {
+                "iterations": len(results),
+                "per_minute": round(len(results) * 60 / self.window_seconds, 2),
+                "p50": round(self._percentile(durations, 50), 3),
+                "p95": round(self._percentile(durations, 95), 3),
+                "error_rate": round(errors / len(results), 4)
+            }
+        return metrics
+
+    @staticmethod
+    def _percentile(values, percentile):
+        rank = max(math.ceil(percentile / 100 * len(values)) - 1, 0)
+        return values[rank]
+
+
+class SoakRunner:
+    """
+    Loops the API and UI booking flows, recycling browser contexts, browsers
+    and the BookingUtils session after a number of iterations or when the
+    RSS of the runner and its browser processes exceeds a limit.
+    """
+
+    def __init__(self, args):
+        self.args = args
+        self.flows = args.flows.split(",")
+        self.metrics = RollingMetrics(args.window)
+        self.iteration = 0
+        self.utils = None
+        self.playwright = None
+        self.browser = None
+        self.context = None
+        self.home_page = HomePage()
+        self.booking_page = BookingComponent()
+
+    # Resource management
+    def _open_utils(self):
+        if self.utils is not None:
+            self.utils.transport.close()
+        self.utils = BookingUtils(transport=self.args.transport)
+
+    def _open_browser(self):
+        self._close_browser()
+        self.browser = self.playwright.chromium.launch(headless=not self.args.headed)
+
+    def _open_context(self):
+        if self.context is not None:
+            self.context.close()
+        self.context = self.browser.new_context()
+
+    def _close_browser(self):
+        if self.context is not None:
+            self.context.close()
+            self.context = None
+        if self.browser is not None:
+            self.browser.close()
+            self.browser = None
+
+    def _recycle(self):
+        """Recycle resources whose iteration budget or the memory limit is used up"""
+        rss = process_tree_rss()
+        over_memory = rss is not None and rss > self.args.max_rss_mb * 2 ** 20
+        if over_memory:
+            logger.warning(f"RSS {rss / 2 ** 20:.0f} MiB over limit, recycling all")
+        if over_memory or self.iteration % self.args.session_recycle == 0:
+            self._open_utils()
+        if "ui" in self.flows:
+            if over_memory or self.iteration % self.args.browser_recycle == 0:
+                self._open_browser()
+                self._open_context()
+            elif self.iteration % self.args.context_recycle == 0:
+                self._open_context()
+        if over_memory:
+            gc.collect()
+
+    # Flows
+    def api_flow(self):
+        """Create a room, book it, read the booking and delete both"""
+        headers = {
+            "Content-Type": "application/json",
+            "Cookie": f"token={self.utils.get_cached_admin_token()}",
+            "User-Agent": "pytest"
+        }
+        room_name = f"Soak Test Room {uuid.uuid4().hex[:8]}"
+        room_data = {**self.utils.test_data["room_data"], "roomName": room_name}
+        self.utils.create_room(self.utils.room_api_base, room_data, headers)
+        room = self.utils.get_available_rooms().first(name=room_name)
+        if room is None:
+            raise AssertionError(f"Room {room_name} not found after creation")
+        room_id = room.room_id
+        try:
+            booking_id = self.utils.create_test_booking(
+                room_id,
+                self.utils.test_data["valid_booking_data"]
+            )
+            if self.utils.get_booking_details(booking_id) is None:
+                raise AssertionError(f"Booking {booking_id} not found")
+            self.utils.delete_booking(
+                self.utils.booking_api_base, booking_id, headers
+            )
+        finally:
+            self.utils.delete_room(self.utils.room_api_base, room_id, headers)
+
+    def ui_flow(self):
+        """
+        Open the booking form and submit invalid data.
+        The validation flow is used so that no bookings pile up on the site.
+        """
+        page = self.context.new_page()
+        try:
+            page.goto(self.utils.base_url)
+            self.booking_page.wait_for_rooms_to_load(page)
+            self.home_page.click_element(
+                page, self.booking_page.BOOKING_BUTTON_SELECTORS
+            )
+            elements = self.booking_page.find_booking_form_elements(page)
+            invalid_booking_data = self.utils.test_data["invalid_booking_data"]
+            for field in ("firstname", "lastname", "email", "phone"):
+                if field in elements:
+                    elements[field].fill(invalid_booking_data[field])
+            if "book_button" in elements:
+                elements["book_button"].click()
+            else:
+                self.home_page.click_element(page, BasePage.SUBMIT_BUTTON_SELECTORS)
+            if not self.home_page.probe_state(page).indicator_visible:
+                raise AssertionError("Missing error indicators for invalid booking data")
+        finally:
+            page.close()
+
+    def _run_flow(self, flow):
+        started = time.perf_counter()
+        ok = True
+        try:
+            getattr(self, f"{flow}_flow")()
+        except Exception as e:
+            ok = False
+            logger.warning(f"Soak iteration {self.iteration} {flow} flow failed: {e}")
+        self.metrics.record(flow, time.perf_counter() - started, ok)
+
+    def _report(self, metrics_file):
+        rss = current_rss()
+        tree_rss = process_tree_rss()
+        snapshot = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "iteration": self.iteration,
+            "rss_mb": round(rss / 2 ** 20, 1) if rss else None,
+            "tree_rss_mb": round(tree_rss / 2 ** 20, 1) if tree_rss else None,
+            "flows": self.metrics.snapshot()
+        }
+        logger.info(f"Soak metrics: {json.dumps(snapshot)}")
+        if metrics_file is not None:
+            metrics_file.write(json.dumps(snapshot) + "\n")
+            metrics_file.flush()
+
+    def run(self):
+        deadline = time.monotonic() + self.args.duration_hours * 3600
+        next_report = time.monotonic() + self.args.report_interval
+        metrics_file = open(self.args.metrics_file, "a") if self.args.metrics_file else None
+        if "ui" in self.flows:
+            from playwright.sync_api import sync_playwright
+            self.playwright = sync_playwright().start()
+        try:
+            while time.monotonic() < deadline:
+                self._recycle()
+                for flow in self.flows:
+                    self._run_flow(flow)
+                self.iteration += 1
+                if time.monotonic() >= next_report:
+                    self._report(metrics_file)
+                    next_report += self.args.report_interval
+        except KeyboardInterrupt:
+            logger.info("Soak run interrupted")
+        finally:
+            self._report(metrics_file)
+            self._close_browser()
+            if self.playwright is not None:
+                self.playwright.stop()
+            if self.utils is not None:
+                self.utils.transport.close()
+            if metrics_file is not None:
+                metrics_file.close()
+
+
+def positive_int(value):
+    """argparse type of counts and intervals that must be at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Soak run of the booking flows")
+    parser.add_argument("--duration-hours", type=float, default=8)
+    parser.add_argument("--flows", default="api,ui",
+                        help="Comma separated flows to loop: api, ui")
+    parser.add_argument("--context-recycle", type=positive_int, default=50,
+                        help="Iterations per browser context")
+    parser.add_argument("--browser-recycle", type=positive_int, default=500,
+                        help="Iterations per browser process")
+    parser.add_argument("--session-recycle", type=positive_int, default=200,
+                        help="Iterations per BookingUtils session")
+    parser.add_argument("--max-rss-mb", type=positive_int, default=1024,
+                        help="Recycle everything when the RSS of the runner and "
+                             "its browser processes exceeds this")
+    parser.add_argument("--window", type=positive_int, default=300,
+                        help="Metrics window in seconds")
+    parser.add_argument("--report-interval", type=positive_int, default=60,
+                        help="Seconds between metrics reports")
+    parser.add_argument("--metrics-file", default="soak_metrics.jsonl",
+                        help="JSON lines file for metrics reports")
+    parser.add_argument("--transport", default=None,
+                        help="HTTP transport for BookingUtils")
+    parser.add_argument("--headed", action="store_true",
+                        help="Run the browser with a visible window")
+    args = parser.parse_args(argv)
+    unknown_flows = set(args.flows.split(",")) - {"api", "ui"}
+    if unknown_flows:
+        parser.error(f"Unknown flows: {', '.join(sorted(unknown_flows))}")
+    return args
+
+
+if __name__ == "__main__":
+    SoakRunner(parse_args()).run()
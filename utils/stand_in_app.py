@@ -0,0 +1,228 @@
+import hashlib
+import json
+import re
+import secrets
+import threading
+from datetime import date
+from urllib.parse import parse_qs
+
+
+class StandInApp:
+    """
+    In-memory WSGI stand-in for the booking platform API.
+    Implements the endpoints used by BookingUtils so API flows can run
+    without network access.
+    """
+
+    ROUTES = [
+        ("POST", r"/api/auth/login", "login"),
+        ("GET", r"/api/room", "list_rooms"),
+        ("POST", r"/api/room", "create_room"),
+        ("GET", r"/api/room/(?P<item_id>\d+)", "get_room"),
+        ("PUT", r"/api/room/(?P<item_id>\d+)", "update_room"),
+        ("DELETE", r"/api/room/(?P<item_id>\d+)", "delete_room"),
+        ("GET", r"/api/booking", "list_bookings"),
+        ("POST", r"/api/booking", "create_booking"),
+        ("GET", r"/api/booking/(?P<item_id>\d+)", "get_booking"),
+        ("DELETE", r"/api/booking/(?P<item_id>\d+)", "delete_booking")
+    ]
+
+    STATUS_TEXT = {
+        200: "OK",
+        201: "Created",
+        202: "Accepted",
+        304: "Not Modified",
+        400: "Bad Request",
+        401: "Unauthorized",
+        403: "Forbidden",
+        404: "Not Found",
+        405: "Method Not Allowed",
+        409: "Conflict"
+    }
+
+    def __init__(self, admin_credentials=None):
+        self.admin_credentials = admin_credentials or {
+            "username": "admin",
+            "password": "password"
+        }
+        self.rooms = {}
+        self.bookings = {}
+        self.tokens = set()
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self._routes = [
+            (method, re.compile(f"^{pattern}/?$"), handler)
+            for method, pattern, handler in self.ROUTES
+        ]
+
+    def __call__(self, environ, start_response):
+        method = environ["REQUEST_METHOD"].upper()
+        path = environ.get("PATH_INFO", "")
+        query = parse_qs(environ.get("QUERY_STRING", ""))
+        body = self._read_json(environ)
+        cookie = environ.get("HTTP_COOKIE", "")
+
+        status, payload = 404, {"error": "Not Found"}
+        path_matched = False
+        for route_method, pattern, handler in self._routes:
+            match = pattern.match(path)
+            if not match:
+                continue
+            path_matched = True
+            if route_method == method:
+                with self._lock:
+                    status, payload = getattr(self, handler)(
+                        body=body,
+                        query=query,
+                        authorized=self._is_authorized(cookie),
+                        **match.groupdict()
+                    )
+                break
+        else:
+            if path_matched:
+                status, payload = 405, {"error": "Method Not Allowed"}
+
+        content = json.dumps(payload).encode()
+        headers = [("Content-Type", "application/json")]
+        if method == "GET" and status == 200:
+            # Conditional GETs like the real platform's ETag filter
+            etag = f'"{hashlib.sha1(content).hexdigest()}"'
+            headers.append(("ETag", etag))
+            if environ.get("HTTP_IF_NONE_MATCH") == etag:
+                status, content = 304, b""
+        headers.append(("Content-Length", str(len(content))))
+        start_response(f"{status} {self.STATUS_TEXT.get(status, '')}", headers)
+        return [content]
+
+    @staticmethod
+    def _read_json(environ):
+        """Read the JSON request body, if any"""
+        length = int(environ.get("CONTENT_LENGTH") or 0)
+        if not length:
+            return None
+        try:
+            return json.loads(environ["wsgi.input"].read(length))
+        except ValueError:
+            return None
+
+    def _is_authorized(self, cookie):
+        return any(token in cookie for token in self.tokens)
+
+    def _new_id(self):
+        item_id = self._next_id
+        self._next_id += 1
+        return item_id
+
+    def login(self, body, **_):
+        if body != self.admin_credentials:
+            return 401, {"error": "Invalid credentials"}
+        token = secrets.token_hex(8)
+        self.tokens.add(token)
+        return 200, {"token": token}
+
+    def list_rooms(self, **_):
+        return 200, {"rooms": list(self.rooms.values())}
+
+    def create_room(self, body, authorized, **_):
+        if not authorized:
+            return 401, {"error": "Authentication required"}
+        if not body or not body.get("roomName"):
+            return 400, {"errors": ["Room name must be set"]}
+        room = {**body, "roomid": self._new_id()}
+        self.rooms[room["roomid"]] = room
+        return 200, {"success": True, "roomid": room["roomid"]}
+
+    def get_room(self, item_id, **_):
+        room = self.rooms.get(int(item_id))
+        if room is None:
+            return 404, {"error": "Room not found"}
+        return 200, room
+
+    def update_room(self, item_id, body, authorized, **_):
+        if not authorized:
+            return 401, {"error": "Authentication required"}
+        room = self.rooms.get(int(item_id))
+        if room is None:
+            return 404, {"error": "Room not found"}
+        room.update(body or {})
+        room["roomid"] = int(item_id)
+        return 202, {"success": True}
+
+    def delete_room(self, item_id, authorized, **_):
+        if not authorized:
+            return 401, {"error": "Authentication required"}
+        if self.rooms.pop(int(item_id), None) is None:
+            return 404, {"error": "Room not found"}
+        return 202, {"success": True}
+
+    def list_bookings(self, query, **_):
+        bookings = self.bookings.values()
+        if "roomid" in query:
+            room_id = int(query["roomid"][0])
+            bookings = [b for b in bookings if b["roomid"] == room_id]
+        return 200, {"bookings": list(bookings)}
+
+    def create_booking(self, body, **_):
+        errors = self._validate_booking(body or {})
+        if errors:
+            return 400, {"errors": errors}
+        dates = body["bookingdates"]
+        checkin = date.fromisoformat(dates["checkin"])
+        checkout = date.fromisoformat(dates["checkout"])
+        for booking in self.bookings.values():
+            booked = booking["bookingdates"]
+            if (booking["roomid"] == body["roomid"]
+                    and checkin < date.fromisoformat(booked["checkout"])
+                    and date.fromisoformat(booked["checkin"]) < checkout):
+                return 409, {"error": "Failed to create booking"}
+        booking = {**body, "bookingid": self._new_id(), "depositpaid": False}
+        self.bookings[booking["bookingid"]] = booking
+        return 201, booking
+
+    @staticmethod
+    def _validate_booking(body):
+        """Returns validation messages like the real platform does"""
+        errors = []
+        for field, max_length in (("firstname", 18), ("lastname", 30)):
+            value = body.get(field) or ""
+            if not value:
+                errors.append("must not be empty")
+            elif not 3 <= len(value) <= max_length:
+                errors.append(f"size must be between 3 and {max_length}")
+        email = body.get("email") or ""
+        if not email:
+            errors.append("must not be empty")
+        elif not re.fullmatch(r"[^@\s]+@[^@\s]+", email):
+            errors.append("must be a well-formed email address")
+        phone = body.get("phone") or ""
+        if not 11 <= len(phone) <= 21:
+            errors.append("size must be between 11 and 21")
+        if body.get("roomid") is None:
+            errors.append("must not be null")
+        return errors + StandInApp._validate_dates(body.get("bookingdates"))
+
+    @staticmethod
+    def _validate_dates(dates):
+        try:
+            checkin = date.fromisoformat(dates["checkin"])
+            checkout = date.fromisoformat(dates["checkout"])
+        except (KeyError, TypeError, ValueError):
+            return ["must not be null"]
+        if checkout <= checkin:
+            return ["Checkout date must be after checkin date"]
+        return []
+
+    def get_booking(self, item_id, authorized, **_):
+        if not authorized:
+            return 403, {"error": "Authentication required"}
+        booking = self.bookings.get(int(item_id))
+        if booking is None:
+            return 404, {"error": "Booking not found"}
+        return 200, booking
+
+    def delete_booking(self, item_id, authorized, **_):
+        if not authorized:
+            return 403, {"error": "Authentication required"}
+        if self.bookings.pop(int(item_id), None) is None:
+            return 404, {"error": "Booking not found"}
+        return 202, {"success": True}
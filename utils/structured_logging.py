@@ -0,0 +1,219 @@
+import json
+import os
+import queue
+import random
+import re
+import threading
+import time
+
+from loguru import logger
+
+from utils.constants_ui import UIConstants
+
+_SECRET_KEYS = re.compile(r"token|password|secret|cookie|authorization", re.IGNORECASE)
+_SECRET_VALUES = re.compile(
+    r"((?:token|password|secret)[\"']?\s*[=:]\s*[\"']?|bearer\s+)[^\s\"';,&}]+",
+    re.IGNORECASE
+)
+REDACTED = "***"
+
+
+def redact(value):
+    """Copy of a value with secrets (by key name or inline 'token=...') masked"""
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if _SECRET_KEYS.search(str(key)) else redact(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [redact(item) for item in value]
+    if isinstance(value, str):
+        return _SECRET_VALUES.sub(rf"\1{REDACTED}", value)
+    return value
+
+
+def truncate(text, limit=UIConstants.LOG_BODY_LIMIT):
+    """Shorten text to limit characters, noting how much was cut"""
+    if text is None or len(text) <= limit:
+        return text
+    return f"{text[:limit]}...(+{len(text) - limit} chars)"
+
+
+def body_of(response, limit=UIConstants.LOG_BODY_LIMIT):
+    """Redacted and truncated body of a response (decodes only up to the limit)"""
+    content = getattr(response, "content", b"") or b""
+    text = content[:limit * 4].decode("utf-8", errors="replace")
+    text = redact(text)
+    if len(content) > limit * 4 or len(text) > limit:
+        return f"{text[:limit]}...({len(content)} bytes)"
+    return text
+
+
+class BackgroundJsonSink:
+    """
+    Loguru sink writing structured events as JSON lines from a background
+    thread. Logging only puts the record fields on a bounded in-memory queue
+    (events are dropped and counted when it is full, never blocking the
+    caller); serialization and file I/O happen in the writer thread.
+    The file is rotated as soon as it reaches max_bytes, also while events
+    keep arriving, keeping `backups` older files.
+    """
+
+    def __init__(self, path, max_bytes, backups, queue_size=10000):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.dropped = 0
+        self._queue = queue.Queue(queue_size)
+        self._thread = threading.Thread(
+            target=self._run, name="structured-log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def __call__(self, message):
+        record = message.record
+        try:
+            self._queue.put_nowait((
+                record["time"], record["level"].name, record["name"],
+                record["function"], record["line"], record["extra"]
+            ))
+        except queue.Full:
+            self.dropped += 1
+
+    def _rotate(self, file):
+        file.close()
+        for index in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{index}"):
+                os.replace(f"{self.path}.{index}", f"{self.path}.{index + 1}")
+        if self.backups:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        return open(self.path, "ab")
+
+    def _run(self):
+        file = open(self.path, "ab")
+        size = file.tell()
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                timestamp, level, name, function, line, extra = item
+                data = (json.dumps({
+                    "time": timestamp.isoformat(),
+                    "level": level,
+                    "where": f"{name}:{function}:{line}",
+                    **extra
+                }, default=str) + "\n").encode("utf-8")
+                file.write(data)
+                size += len(data)
+                if size >= self.max_bytes:
+                    file = self._rotate(file)
+                    size = 0
+                elif self._queue.empty():
+                    file.flush()
+        finally:
+            file.close()
+
+    def close(self):
+        """Write the queued events and stop the writer thread"""
+        self._queue.put(None)
+        self._thread.join()
+
+
+class _LevelStats:
+    __slots__ = ("calls", "emitted", "seconds")
+
+    def __init__(self):
+        self.calls = 0
+        self.emitted = 0
+        self.seconds = 0.0
+
+
+class StructuredLogger:
+    """
+    Structured log events for API hot paths: event name plus key/value
+    fields bound to the loguru record (written as JSON lines by a
+    BackgroundJsonSink). Events are sampled per level before anything is formatted;
+    callable field values (e.g. lambda: body_of(response)) are evaluated
+    only for emitted events. Fields are redacted and the time spent per
+    call is measured.
+    """
+
+    def __init__(self, sampling=None):
+        self.sampling = dict(UIConstants.LOG_SAMPLING)
+        self.sampling.update(sampling or {})
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def configure(self, sampling):
+        """Update per-level sampling rates, e.g. {"DEBUG": 0.01}"""
+        self.sampling.update(
+            {level.upper(): float(rate) for level, rate in sampling.items()}
+        )
+
+    @staticmethod
+    def parse_sampling(text):
+        """
+        Parses 'DEBUG=0.01,INFO=0.5' into a rates dict.
+        Raises ValueError for unknown levels and rates outside [0, 1].
+        """
+        rates = {}
+        for part in filter(None, (part.strip() for part in text.split(","))):
+            level, _, rate = part.partition("=")
+            level = level.strip().upper()
+            try:
+                logger.level(level)
+            except ValueError:
+                raise ValueError(f"unknown log level in '{part}'") from None
+            try:
+                rates[level] = float(rate)
+            except ValueError:
+                raise ValueError(f"expected LEVEL=RATE, e.g. DEBUG=0.01, got '{part}'") from None
+            if not 0 <= rates[level] <= 1:
+                raise ValueError(f"sampling rate of {level} must be in [0, 1], got {rate}")
+        return rates
+
+    def log(self, level, event, **fields):
+        started = time.perf_counter()
+        emitted = random.random() < self.sampling.get(level, 1.0)
+        if emitted:
+            fields = redact({
+                key: value() if callable(value) else value
+                for key, value in fields.items()
+            })
+            message = " ".join(
+                [event] + [f"{key}={value}" for key, value in fields.items()]
+            )
+            logger.opt(depth=2).bind(event=event, **fields).log(level, message)
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            stats = self._stats.setdefault(level, _LevelStats())
+            stats.calls += 1
+            stats.emitted += emitted
+            stats.seconds += elapsed
+
+    def debug(self, event, **fields):
+        self.log("DEBUG", event, **fields)
+
+    def info(self, event, **fields):
+        self.log("INFO", event, **fields)
+
+    def warning(self, event, **fields):
+        self.log("WARNING", event, **fields)
+
+    def stats(self):
+        """Calls, emitted events and mean cost per call (microseconds) by level"""
+        with self._lock:
+            return {
+                level: {
+                    "calls": stats.calls,
+                    "emitted": stats.emitted,
+                    "us_per_call": round(stats.seconds / stats.calls * 1e6, 1)
+                }
+                for level, stats in self._stats.items()
+            }
+
+
+api_log = StructuredLogger()
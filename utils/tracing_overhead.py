@@ -0,0 +1,79 @@
+import time
+from pathlib import Path
+
+import pytest
+# The Tracing class is not exported by playwright.sync_api
+from playwright.sync_api._generated import Tracing
+
+
+class TracingOverheadPlugin:
+    """
+    Measures what pytest-playwright's --tracing retain-on-failure costs:
+    the time spent in the tracing calls of every test (start in setup and
+    stop in teardown, which writes the trace of every test to the
+    temporary artifacts directory). Recording snapshots during the test's
+    actions adds to this and is not measured. The time is attached to the
+    teardown report, so the controller also sums it under xdist.
+    """
+
+    METHODS = ("start", "stop", "start_chunk", "stop_chunk")
+
+    def __init__(self, config):
+        self.config = config
+        self.is_worker = hasattr(config, "workerinput")
+        self.tests = {}
+        self._current = 0.0
+        self._originals = {}
+
+    def pytest_configure(self, config):
+        """Enable retain-on-failure tracing and wrap the tracing calls to time them"""
+        if config.getoption("tracing", "off") == "off":
+            config.option.tracing = "retain-on-failure"
+        for name in self.METHODS:
+            original = getattr(Tracing, name)
+            self._originals[name] = original
+            setattr(Tracing, name, self._timed(original))
+
+    def _timed(self, method):
+        def timed(tracing, *args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return method(tracing, *args, **kwargs)
+            finally:
+                self._current += time.perf_counter() - started
+        return timed
+
+    def pytest_runtest_logstart(self, nodeid, location):
+        self._current = 0.0
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        if report.when == "teardown" and self._current:
+            report.user_properties.append(("tracing_overhead", self._current))
+
+    def pytest_runtest_logreport(self, report):
+        if report.when != "teardown":
+            return
+        for name, value in report.user_properties:
+            if name == "tracing_overhead":
+                self.tests[report.nodeid] = value
+
+    def pytest_unconfigure(self):
+        for name, original in self._originals.items():
+            setattr(Tracing, name, original)
+        self._originals = {}
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.is_worker or not self.tests:
+            return
+        overhead = sum(self.tests.values())
+        traces = sorted(Path(self.config.getoption("output")).glob("**/trace.zip"))
+        terminalreporter.write_sep("-", "failure tracing")
+        terminalreporter.write_line(
+            f"Traced {len(self.tests)} tests, overhead {overhead:.2f}s "
+            f"({overhead / len(self.tests) * 1000:.0f} ms per test)"
+        )
+        for trace in traces:
+            terminalreporter.write_line(f"Trace: {trace} (playwright show-trace {trace})")
@@ -0,0 +1,241 @@
+import io
+import json
+import os
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from urllib.parse import urlencode, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.constants_ui import UIConstants
+from utils.models import loads
+
+
+class HttpResponse:
+    """Minimal response object with the part of the requests API used by tests"""
+
+    __slots__ = ("status_code", "headers", "content", "url")
+
+    def __init__(self, status_code, headers, content, url):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return loads(self.content)
+
+
+class Transport(ABC):
+    """Interface of the HTTP transports behind BookingUtils"""
+
+    name = None
+    # Whether requests reach the real site and count against its rate limit
+    rate_limited = True
+
+    @abstractmethod
+    def request(self, method, url, headers=None, json=None, params=None,
+                timeout=None):
+        """Send a request and return a response object"""
+
+    @contextmanager
+    def stream(self, method, url, headers=None, params=None, timeout=None):
+        """
+        Send a request and yield (status code, iterator of body chunks).
+        The connection is released when the context exits, also when the
+        body was not read completely.
+        """
+        response = self.request(
+            method, url, headers=headers, params=params, timeout=timeout
+        )
+        content = response.content
+        yield response.status_code, (
+            content[start:start + UIConstants.STREAM_CHUNK_SIZE]
+            for start in range(0, len(content), UIConstants.STREAM_CHUNK_SIZE)
+        )
+
+    def close(self):
+        """Release connections held by the transport"""
+
+
+class RequestsTransport(Transport):
+    """HTTP/1.1 transport based on a pooled requests session"""
+
+    name = "requests"
+
+    def __init__(self):
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=UIConstants.API_POOL_SIZE,
+            pool_maxsize=UIConstants.API_POOL_SIZE
+        ))
+
+    def request(self, method, url, headers=None, json=None, params=None,
+                timeout=None):
+        return self.session.request(
+            method,
+            url,
+            headers=headers,
+            json=json,
+            params=params,
+            timeout=timeout
+        )
+
+    @contextmanager
+    def stream(self, method, url, headers=None, params=None, timeout=None):
+        response = self.session.request(
+            method,
+            url,
+            headers=headers,
+            params=params,
+            timeout=timeout,
+            stream=True
+        )
+        try:
+            yield response.status_code, response.iter_content(
+                UIConstants.STREAM_CHUNK_SIZE
+            )
+        finally:
+            response.close()
+
+    def close(self):
+        self.session.close()
+
+
+class Http2Transport(Transport):
+    """
+    Transport multiplexing requests to one host over a single HTTP/2
+    connection. Requires the optional 'httpx[http2]' package.
+    """
+
+    name = "http2"
+
+    def __init__(self):
+        try:
+            import httpx
+        except ImportError as e:
+            raise RuntimeError(
+                "The http2 transport requires httpx: pip install 'httpx[http2]'"
+            ) from e
+        self.client = httpx.Client(http2=True)
+
+    def request(self, method, url, headers=None, json=None, params=None,
+                timeout=None):
+        response = self.client.request(
+            method,
+            url,
+            headers=headers,
+            json=json,
+            params=params,
+            timeout=timeout
+        )
+        return HttpResponse(
+            response.status_code,
+            dict(response.headers),
+            response.content,
+            str(response.url)
+        )
+
+    @contextmanager
+    def stream(self, method, url, headers=None, params=None, timeout=None):
+        with self.client.stream(
+                method,
+                url,
+                headers=headers,
+                params=params,
+                timeout=timeout
+        ) as response:
+            yield response.status_code, response.iter_bytes(
+                UIConstants.STREAM_CHUNK_SIZE
+            )
+
+    def close(self):
+        self.client.close()
+
+
+class InProcessTransport(Transport):
+    """
+    Transport calling a WSGI application directly, without sockets.
+    Uses the in-memory StandInApp by default.
+    """
+
+    name = "inprocess"
+    rate_limited = False
+
+    def __init__(self, app=None):
+        if app is None:
+            from utils.stand_in_app import StandInApp
+            app = StandInApp()
+        self.app = app
+
+    def request(self, method, url, headers=None, json=None, params=None,
+                timeout=None):
+        parts = urlsplit(url)
+        body = b"" if json is None else _json_dumps(json)
+        query = parts.query
+        if params:
+            query = "&".join(filter(None, [query, urlencode(params)]))
+        environ = {
+            "REQUEST_METHOD": method.upper(),
+            "SCRIPT_NAME": "",
+            "PATH_INFO": parts.path,
+            "QUERY_STRING": query,
+            "SERVER_NAME": parts.hostname or "localhost",
+            "SERVER_PORT": str(parts.port or 443),
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "CONTENT_LENGTH": str(len(body)),
+            "wsgi.input": io.BytesIO(body),
+            "wsgi.url_scheme": parts.scheme or "https",
+            "wsgi.errors": io.StringIO()
+        }
+        for name, value in (headers or {}).items():
+            key = name.upper().replace("-", "_")
+            if key not in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+                key = f"HTTP_{key}"
+            environ[key] = value
+
+        status = {}
+
+        def start_response(status_line, response_headers, exc_info=None):
+            status["code"] = int(status_line.split(" ", 1)[0])
+            status["headers"] = dict(response_headers)
+
+        content = b"".join(self.app(environ, start_response))
+        return HttpResponse(status["code"], status["headers"], content, url)
+
+
+def _json_dumps(data):
+    return json.dumps(data).encode()
+
+
+TRANSPORTS = {
+    transport.name: transport
+    for transport in (RequestsTransport, Http2Transport, InProcessTransport)
+}
+
+
+def create_transport(name=None, default=None):
+    """
+    Create a transport by name.
+    Falls back to the BOOKING_TRANSPORT environment variable, then to
+    the given default (e.g. from test data), then to 'requests'.
+    """
+    name = (
+        name or os.environ.get("BOOKING_TRANSPORT") or default
+        or RequestsTransport.name
+    )
+    try:
+        return TRANSPORTS[name]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown transport '{name}', expected one of: {', '.join(TRANSPORTS)}"
+        )
@@ -1,10 +1,16 @@
+import copy
 import json
+import threading
 import time
+import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
+from urllib.parse import urlsplit
 
 import fake_useragent
-import requests
 
 from utils.test_data import (
     base_url,
@@ -14,7 +20,14 @@ from utils.test_data import (
     invalid_booking_data,
     room_data
 )
+from utils.adaptive_timeouts import timeouts
 from utils.constants_ui import UIConstants
+from utils.json_stream import iter_array_items
+from utils.models import Booking, ModelCollection, Room, loads
+from utils.rate_limiter import rate_limiter
+from utils.single_flight import SingleFlight
+from utils.structured_logging import api_log, body_of, truncate
+from utils.transports import create_transport
 from loguru import logger
 
 ua = fake_useragent.UserAgent()
@@ -23,20 +36,50 @@ ua = fake_useragent.UserAgent()
 class BookingUtils:
     """Utility class for common test operations and data management"""
 
-    def __init__(self):
+    def __init__(self, transport=None, result_ttl=UIConstants.COALESCE_RESULT_TTL):
         self.test_data_file = "test_data.json"
         self.test_data_path = Path(__file__).resolve().parent / self.test_data_file
         self.test_data = self.get_test_data()
         self.base_url = self.test_data["base_url"]
         self.api_url = self.test_data.get("api_url", f"{self.base_url}/api/booking")
         self.admin_credentials = self.test_data["admin_credentials"]
-        self.session = requests.Session()
+        # Transport name: argument, BOOKING_TRANSPORT, "transport" in test data
+        self.transport = create_transport(
+            transport, default=self.test_data.get("transport")
+        )
+        # Concurrent identical GETs share one in-flight request
+        self.single_flight = SingleFlight(result_ttl)
+        # ETag and parsed models of recent GETs, for conditional requests
+        self._etags = OrderedDict()
+        self._etags_lock = threading.Lock()
+        self._admin_token = None
+        self._admin_token_time = 0.0
+        self._admin_token_lock = threading.Lock()
         self.test_data.update({
             "valid_booking_data": valid_booking_data,
             "invalid_booking_data": invalid_booking_data,
             "room_data": room_data
         })
 
+    @property
+    def session(self):
+        """
+        Deprecated: the requests session of the 'requests' transport.
+        Send requests through the BookingUtils methods (or self.transport) instead.
+        """
+        warnings.warn(
+            "BookingUtils.session is deprecated, use the BookingUtils methods "
+            "or BookingUtils.transport",
+            DeprecationWarning,
+            stacklevel=2
+        )
+        try:
+            return self.transport.session
+        except AttributeError:
+            raise AttributeError(
+                f"The '{self.transport.name}' transport has no requests session"
+            ) from None
+
     def get_future_dates(self, days_from_now=None, checkout_days_later=None):
         """Method to get future check-in and check-out dates"""
         days_from_now = days_from_now or UIConstants.DEFAULT_CHECKIN_DAYS
@@ -52,6 +95,120 @@ class BookingUtils:
             "checkout_month": checkout_date.month
         }
 
+    def endpoint_group(self, method, url):
+        """
+        Returns the endpoint group of a request per transport,
+        e.g. 'api:requests:GET /api/room/{id}', so timings of the
+        in-process stand-in never set timeouts of the real site.
+        """
+        segments = [
+            "{id}" if segment.isdigit() else segment
+            for segment in urlsplit(url).path.rstrip("/").split("/")
+        ]
+        return f"api:{self.transport.name}:{method.upper()} {'/'.join(segments)}"
+
+    def _request(self, method, url, timeout=None, **kwargs):
+        """
+        Sends a request through the configured transport.
+        Waits for the host-wide rate limiter first; the timeout (seconds)
+        is learned from previous calls to the same endpoint.
+        """
+        if self.transport.rate_limited:
+            rate_limiter.acquire(rate_limiter.endpoint_class(method, url))
+        with timeouts.measure(
+                self.endpoint_group(method, url),
+                UIConstants.TIMEOUT_API_REQUEST,
+                None if timeout is None else timeout * 1000,
+                floor=UIConstants.ADAPTIVE_TIMEOUT_API_FLOOR,
+                ceiling=UIConstants.ADAPTIVE_TIMEOUT_API_CEILING
+        ) as wait:
+            response = self.transport.request(
+                method, url, timeout=wait.timeout / 1000, **kwargs
+            )
+        self._check_token_rejected(response.status_code, kwargs.get("headers"))
+        api_log.debug(
+            "api.request",
+            method=method.upper(),
+            url=url,
+            status=response.status_code,
+            ms=round(wait.elapsed_ms, 1)
+        )
+        if method.upper() not in ("GET", "HEAD"):
+            self.single_flight.invalidate(url)
+        return response
+
+    @contextmanager
+    def _stream(self, method, url, headers=None, params=None):
+        """
+        Streaming counterpart of _request: yields (status code, body chunks)
+        with the same rate limiting and adaptive timeout.
+        """
+        if self.transport.rate_limited:
+            rate_limiter.acquire(rate_limiter.endpoint_class(method, url))
+        group = self.endpoint_group(method, url)
+        timeout = timeouts.get(
+            group,
+            UIConstants.TIMEOUT_API_REQUEST,
+            floor=UIConstants.ADAPTIVE_TIMEOUT_API_FLOOR,
+            ceiling=UIConstants.ADAPTIVE_TIMEOUT_API_CEILING
+        ) / 1000
+        started = time.perf_counter()
+        responded = False
+        try:
+            with self.transport.stream(
+                    method, url, headers=headers, params=params, timeout=timeout
+            ) as (status_code, chunks):
+                responded = True
+                timeouts.record(group, (time.perf_counter() - started) * 1000)
+                self._check_token_rejected(status_code, headers)
+                yield status_code, chunks
+        except Exception:
+            if not responded and time.perf_counter() - started >= timeout:
+                timeouts.record_timeout(group, timeout * 1000)
+            raise
+
+    def _get_json(self, url, headers=None, parse=None):
+        """
+        GET a JSON resource and return (status code, parse(body) or None).
+        parse must turn the body into immutable data (e.g. a tuple of models),
+        which is shared: identical concurrent calls are coalesced into one
+        request. Requests are conditional once the resource returned an ETag:
+        an unchanged resource is answered with 304 and the parsed data kept
+        for the ETAG_CACHE_SIZE most recently used GETs.
+        """
+        key = (url, (headers or {}).get("Cookie"))
+
+        def fetch():
+            with self._etags_lock:
+                cached = self._etags.get(key)
+            request_headers = dict(headers or {})
+            if cached:
+                request_headers["If-None-Match"] = cached[0]
+            response = self._request("GET", url, headers=request_headers)
+            if response.status_code == 304 and cached:
+                with self._etags_lock:
+                    if key in self._etags:
+                        self._etags.move_to_end(key)
+                return 200, cached[1]
+            data = None
+            if response.status_code == 200:
+                data = loads(response.content)
+                data = parse(data) if parse is not None else data
+            etag = response.headers.get("ETag") or response.headers.get("etag")
+            with self._etags_lock:
+                if etag and data is not None and parse is not None:
+                    self._etags[key] = (etag, data)
+                    self._etags.move_to_end(key)
+                    while len(self._etags) > UIConstants.ETAG_CACHE_SIZE:
+                        self._etags.popitem(last=False)
+                else:
+                    self._etags.pop(key, None)
+            return response.status_code, data
+
+        # Parsed data is immutable; raw bodies are copied for every caller
+        share = (lambda value: value) if parse is not None else copy.deepcopy
+        return self.single_flight.do(url, key, fetch, share=share)
+
     @property
     def room_api_base(self):
         """Returns the base URL for room operations (Admin API)"""
@@ -99,25 +256,69 @@ class BookingUtils:
                 "User-Agent": ua.firefox
             }
 
-            response = self.session.post(
+            response = self._request(
+                "POST",
                 login_url,
                 json=self.admin_credentials,
-                headers=headers,
-                timeout=30
+                headers=headers
             )
 
             if response.ok:
                 data = response.json()
                 return data.get("token")
             else:
-                logger.info(
-                    f"[API LOGIN FAIL] Status: {response.status_code},"
-                    f" Response: {response.text}"
+                api_log.info(
+                    "api.login_failed",
+                    status=response.status_code,
+                    body=lambda: body_of(response)
                 )
         except Exception as exc:
             logger.info(f"[API LOGIN FAIL] Exception: {exc}")
         return None
 
+    def get_cached_admin_token(self, refresh=False):
+        """
+        Get the admin token obtained earlier in this session. Logs in again
+        when there is none, it is older than ADMIN_TOKEN_TTL, it was
+        rejected by the API (see invalidate_admin_token) or refresh is set.
+        """
+        with self._admin_token_lock:
+            expired = (
+                time.monotonic() - self._admin_token_time > UIConstants.ADMIN_TOKEN_TTL
+            )
+            if refresh or expired or not self._admin_token:
+                self._admin_token = self.get_admin_auth_token()
+                self._admin_token_time = time.monotonic()
+            return self._admin_token
+
+    def invalidate_admin_token(self, token=None):
+        """Drop the cached admin token, only if it is still `token` when given"""
+        with self._admin_token_lock:
+            if token is None or token == self._admin_token:
+                self._admin_token = None
+
+    def _check_token_rejected(self, status_code, headers):
+        """Invalidate the cached admin token when a request sent with it was rejected"""
+        token = self._admin_token
+        if (status_code in (401, 403) and token
+                and f"token={token}" in (headers or {}).get("Cookie", "")):
+            logger.info("Admin token was rejected, logging in again on next use")
+            self.invalidate_admin_token(token)
+
+    def warm_up_connections(self, count=UIConstants.API_POOL_SIZE):
+        """Open pooled connections to the API by sending concurrent requests"""
+        headers = {"User-Agent": ua.firefox}
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            responses = list(executor.map(
+                lambda _: self._request(
+                    "GET",
+                    f"{self.base_url}/api/room/",
+                    headers=headers
+                ),
+                range(count)
+            ))
+        return sum(response.ok for response in responses)
+
     def create_test_room(self, room_data=None):
         """Create a test room and return room ID"""
         if not room_data:
@@ -134,15 +335,14 @@ class BookingUtils:
         }
 
         try:
-            response = self.session.post(
+            response = self._request(
+                "POST",
                 f"{self.base_url}/api/room",
                 json=room_data,
-                headers=headers,
-                timeout=30
+                headers=headers
             )
             if response.status_code in [200, 201]:
-                result = response.json()
-                return result.get("roomid") or result.get("id")
+                return Room.id_from(loads(response.content))
             else:
                 raise Exception(
                     f"Failed to create test room: Status {response.status_code}")
@@ -162,10 +362,10 @@ class BookingUtils:
         }
 
         try:
-            response = self.session.delete(
+            response = self._request(
+                "DELETE",
                 f"{self.base_url}/api/room/{room_id}",
-                headers=headers,
-                timeout=30
+                headers=headers
             )
             return response.status_code in [200, 202, 204]
         except Exception as e:
@@ -173,22 +373,66 @@ class BookingUtils:
             return False
 
     def get_available_rooms(self):
-        """Get list of available rooms"""
+        """Get list of available rooms as a collection of Room models"""
         try:
             headers = {
                 "User-Agent": ua.firefox,
             }
-            response = self.session.get(
+            status_code, rooms = self._get_json(
                 f"{self.base_url}/api/room/",
                 headers=headers,
-                timeout=30
+                parse=lambda data: tuple(
+                    Room.from_dict(item) for item in data.get("rooms", [])
+                )
             )
-            if response.status_code == 200:
-                data = response.json()
-                return data.get("rooms", [])
+            if status_code == 200:
+                return ModelCollection(rooms)
         except Exception as e:
             logger.info(f"Failed to get rooms: {e}")
-        return []
+        return ModelCollection()
+
+    def iter_rooms(self, name_prefix=None):
+        """
+        Yield Room models one by one while the room list is downloaded.
+        Memory use does not depend on the size of the listing, and
+        stopping the iteration early closes the connection.
+        """
+        headers = {"User-Agent": ua.firefox}
+        with self._stream("GET", f"{self.base_url}/api/room/", headers) as (
+                status_code, chunks
+        ):
+            if status_code != 200:
+                logger.info(f"Failed to stream rooms: Status {status_code}")
+                return
+            for item in iter_array_items(chunks, "rooms"):
+                room = Room.from_dict(item)
+                if name_prefix is None or (room.name or "").startswith(name_prefix):
+                    yield room
+
+    def iter_bookings(self, room_id, name_prefix=None):
+        """
+        Yield the Booking models of a room one by one while they are downloaded.
+        name_prefix filters by the guest's first name.
+        """
+        headers = {
+            "Cookie": f"token={self.get_cached_admin_token()}",
+            "User-Agent": "pytest"
+        }
+        with self._stream(
+                "GET",
+                f"{self.base_url}/api/booking",
+                headers,
+                params={"roomid": room_id}
+        ) as (status_code, chunks):
+            if status_code != 200:
+                logger.info(f"Failed to stream bookings: Status {status_code}")
+                return
+            for item in iter_array_items(chunks, "bookings"):
+                booking = Booking.from_dict(item)
+                if name_prefix is None or (booking.firstname or "").startswith(
+                        name_prefix
+                ):
+                    yield booking
 
     def create_test_booking(self, room_id, booking_data):
         """Create a test booking and return booking ID"""
@@ -212,29 +456,27 @@ class BookingUtils:
 
         headers = {
             "Content-Type": "application/json",
-            "Cookie": f"token={self.get_admin_auth_token()}",
+            "Cookie": f"token={self.get_cached_admin_token()}",
             "User-Agent": ua.firefox
         }
         try:
-            response = self.session.post(
+            response = self._request(
+                "POST",
                 f"{self.base_url}/api/booking/",
                 json=payload,
-                headers=headers,
-                timeout=30
-            )
-            logger.info(
-                f"Booking creation status: "
-                f"{response.status_code}, response: {response.text}"
+                headers=headers
             )
+            api_log.debug("booking.create", body=lambda: body_of(response))
             if response.ok:
-                result = response.json()
-                booking_id = result.get("bookingid") or result.get("id")
-                logger.info(f"Created booking ID: {booking_id}")
+                booking_id = Booking.id_from(loads(response.content))
+                api_log.info(
+                    "booking.created", status=response.status_code, booking_id=booking_id
+                )
                 return booking_id
             else:
                 raise Exception(
                     f"Booking is not created: "
-                    f"Status {response.status_code} - {response.text}"
+                    f"Status {response.status_code} - {body_of(response)}"
                 )
         except Exception as exc:
             raise Exception(f"Booking is not created: {exc}")
@@ -242,30 +484,34 @@ class BookingUtils:
     def cleanup_test_rooms(self, api_base, headers):
         """Delete all rooms with 'Test' in their name"""
         try:
-            response = self.session.get(api_base, headers=headers, timeout=30)
+            response = self._request("GET", api_base, headers=headers)
             if response.status_code == 200:
-                data = response.json()
-                rooms = data.get("rooms", [])
+                rooms = ModelCollection.of(Room, loads(response.content).get("rooms", []))
                 for room in rooms:
-                    room_name = room.get("roomName", "")
-                    if "Test" in room_name:
-                        room_id = room.get("roomid") or room.get("id")
-                        if room_id:
-                            self.session.delete(f"{api_base}/{room_id}",
-                                                headers=headers, timeout=30)
-                            time.sleep(1)  # Wait to avoid rate limiting
+                    if "Test" in (room.name or "") and room.room_id:
+                        # Paced by the shared rate limiter
+                        self._request(
+                            "DELETE",
+                            f"{api_base}/{room.room_id}",
+                            headers=headers
+                        )
         except Exception as e:
             logger.info(f"Cleanup failed: {e}")
 
     def create_room(self, api_base, room_data, headers):
-        """Create a room via API"""
+        """
+        Create a room via API and return it as a Room model: the sent data
+        with the room id, when the API returns it
+        """
 
         try:
-            response = self.session.post(api_base, json=room_data, headers=headers,
-                                         timeout=30)
+            response = self._request("POST", api_base, json=room_data, headers=headers)
             if response.ok:
-                logger.info(f"Room created successfully: {response.json()}")
-                return response.json()
+                result = loads(response.content) if response.content else {}
+                api_log.info(
+                    "room.created", status=response.status_code, room_id=Room.id_from(result)
+                )
+                return Room.from_dict({**room_data, **result})
             raise Exception(f"Failed to create room: Status {response.status_code}")
         except Exception as e:
             raise Exception(f"Failed to create room: {e}")
@@ -273,10 +519,10 @@ class BookingUtils:
     def delete_room(self, api_base, room_id, headers):
         """Delete a room via API"""
         try:
-            response = self.session.delete(
+            response = self._request(
+                "DELETE",
                 f"{api_base}/{room_id}",
-                headers=headers,
-                timeout=30
+                headers=headers
             )
             return response.status_code in [200, 202, 204]
         except Exception as e:
@@ -284,19 +530,23 @@ class BookingUtils:
             return False
 
     def create_booking(self, booking_api, booking_data):
-        """Create a booking via API"""
+        """Create a booking via API and return it as a Booking model"""
         try:
             headers = {
                 "Content-Type": "application/json",
                 "User-Agent": ua.firefox
             }
-            response = self.session.post(booking_api, json=booking_data,
-                                         headers=headers, timeout=30)
+            response = self._request(
+                "POST",
+                booking_api,
+                json=booking_data,
+                headers=headers
+            )
             if response.status_code in [200, 201]:
-                return response.json()
+                return Booking.from_dict(loads(response.content))
             raise Exception(
                 f"Failed to create booking: "
-                f"Status {response.status_code}, {response.text}"
+                f"Status {response.status_code}, {body_of(response)}"
             )
         except Exception as e:
             raise Exception(f"Failed to create booking: {e}")
@@ -304,10 +554,10 @@ class BookingUtils:
     def delete_booking(self, booking_api, booking_id, headers):
         """Delete a booking via API"""
         try:
-            response = self.session.delete(
+            response = self._request(
+                "DELETE",
                 f"{booking_api}/{booking_id}",
-                headers=headers,
-                timeout=30
+                headers=headers
             )
             return response.status_code in [200, 202, 204]
         except Exception as e:
@@ -320,26 +570,30 @@ class BookingUtils:
             method="GET",
             data=None,
             headers=None,
-            timeout=30,
+            timeout=None,
             retries=3
     ):
         """Wait for API response with retries"""
         for attempt in range(retries):
             try:
                 if method.upper() == "GET":
-                    response = self.session.get(
+                    response = self._request(
+                        "GET",
                         url,
                         headers=headers,
-                        timeout=timeout)
+                        timeout=timeout
+                    )
                 elif method.upper() == "POST":
-                    response = self.session.post(
+                    response = self._request(
+                        "POST",
                         url,
                         json=data,
                         headers=headers,
                         timeout=timeout
                     )
                 elif method.upper() == "DELETE":
-                    response = self.session.delete(
+                    response = self._request(
+                        "DELETE",
                         url,
                         headers=headers,
                         timeout=timeout
@@ -352,26 +606,73 @@ class BookingUtils:
             except Exception as e:
                 if attempt == retries - 1:
                     raise e
-                time.sleep(1)  # Wait before retry
+                # Growing delay before retry
+                time.sleep(min(
+                    UIConstants.WAIT_UNTIL_INTERVAL * UIConstants.WAIT_UNTIL_BACKOFF ** attempt,
+                    UIConstants.WAIT_UNTIL_MAX_INTERVAL
+                ))
 
         return None
 
+    def wait_until(
+            self,
+            fetch,
+            predicate=bool,
+            timeout=None,
+            name="condition",
+            interval=UIConstants.WAIT_UNTIL_INTERVAL,
+            backoff=UIConstants.WAIT_UNTIL_BACKOFF,
+            max_interval=UIConstants.WAIT_UNTIL_MAX_INTERVAL
+    ):
+        """
+        Polls fetch() until predicate(value) holds or the deadline (timeout
+        in ms) passes, and returns the last fetched value. The interval
+        between polls grows exponentially; GETs of unchanged resources are
+        answered with 304 (see _get_json). The deadline is fixed
+        (WAIT_UNTIL_TIMEOUT unless given), not learned: convergence is
+        usually immediate, and a learned deadline would fail on a slow
+        backend. The convergence time is recorded for reporting only.
+        """
+        group = f"wait:{name}"
+        if timeout is None:
+            timeout = UIConstants.WAIT_UNTIL_TIMEOUT
+        started = time.perf_counter()
+        deadline = started + timeout / 1000
+        attempts = 0
+        while True:
+            value = fetch()
+            attempts += 1
+            if predicate(value):
+                elapsed = (time.perf_counter() - started) * 1000
+                timeouts.record(group, elapsed)
+                api_log.info(
+                    "wait.converged", name=name, ms=round(elapsed, 1), attempts=attempts
+                )
+                return value
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                timeouts.record_timeout(group, timeout)
+                api_log.info("wait.timed_out", name=name, ms=timeout, attempts=attempts)
+                return value
+            time.sleep(min(interval, remaining))
+            interval = min(interval * backoff, max_interval)
+
     def verify_room_exists(self, room_id):
         """Verify if a room exists by ID"""
         try:
-            rooms = self.get_available_rooms()
-            for room in rooms:
-                if room.get("roomid") == room_id or room.get("id") == room_id:
-                    return True
-            return False
+            return self.get_available_rooms().by_id(room_id) is not None
         except Exception as e:
             logger.info(f"Error during checking the room: {e}")
             return False
 
     def get_booking_details(self, booking_id):
-        """Get booking details by ID"""
+        """
+        Get booking details by ID as a Booking model. Uses the cached admin
+        token, so polls of a booking are conditional GETs of the same
+        resource and do not spend the login rate budget.
+        """
         try:
-            token = self.get_admin_auth_token()
+            token = self.get_cached_admin_token()
             if not token:
                 logger.info("No admin token")
                 return None
@@ -383,27 +684,31 @@ class BookingUtils:
             }
 
             url = f"{self.base_url}/api/booking/{booking_id}"
-            logger.info(f"GET {url} with headers: {headers}")
-            response = self.session.get(url, headers=headers, timeout=30)
-            logger.info(f"Status code: {response.status_code}, Response: {response.text}")
-            if response.status_code == 200:
-                return response.json()
+            api_log.debug("booking.get", url=url, headers=headers)
+            status_code, booking = self._get_json(
+                url, headers=headers, parse=Booking.from_dict
+            )
+            api_log.info("booking.details", booking_id=booking_id, status=status_code)
+            api_log.debug("booking.details.body", body=lambda: truncate(str(booking)))
+            if status_code == 200:
+                return booking
         except Exception as exc:
             logger.info(f"Failed to get booking details: {exc}")
         return None
 
     def update_room(self, room_id, room_data, headers):
-        """Update room details via API"""
+        """Update room details via API and return the updated Room model"""
         try:
             # PUT request to update room
-            response = self.session.put(
+            response = self._request(
+                "PUT",
                 f"{self.base_url}/api/room/{room_id}",
                 json=room_data,
-                headers=headers,
-                timeout=30
+                headers=headers
             )
             if response.status_code in [200, 201, 202]:
-                return response.json()
+                result = loads(response.content) if response.content else {}
+                return Room.from_dict({**room_data, "roomid": room_id, **result})
             raise Exception(f"Failed to update room: Status {response.status_code}")
         except Exception as e:
             raise Exception(f"Failed to update room: {e}")
@@ -0,0 +1,74 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from loguru import logger
+
+
+class SessionWarmUp:
+    """
+    Runs the per-worker warm-up steps concurrently and reports their durations.
+    API steps run in background threads, browser steps run in the calling
+    thread because the sync Playwright API is bound to it.
+    """
+
+    def __init__(self, utils):
+        self.utils = utils
+        self.timings = {}
+        self._started = None
+        self._finished = None
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=2,
+            thread_name_prefix="warm-up"
+        )
+        self._futures = []
+
+    def start(self):
+        """Start API connection and admin login warm-up in the background"""
+        self._started = time.perf_counter()
+        self._futures = [
+            self._executor.submit(
+                self.run, "api_connections", self.utils.warm_up_connections
+            ),
+            self._executor.submit(
+                self.run, "admin_token", self.utils.get_cached_admin_token
+            )
+        ]
+
+    def run(self, step, func, *args, critical=False):
+        """
+        Run a warm-up step and record how long it took. Failures of
+        best-effort steps are logged and return None; failures of critical
+        steps (the browser the tests need) are raised.
+        """
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        except Exception as e:
+            logger.warning(f"Warm-up step '{step}' failed: {e}")
+            if critical:
+                raise
+            return None
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                self.timings[step] = finished - started
+                self._finished = max(self._finished or finished, finished)
+            logger.info(f"Warm-up step '{step}' took {self.timings[step]:.2f}s")
+
+    def wait(self):
+        """
+        Wait for the background steps and report the warm-up time:
+        from the start until the last step finished, not until this call.
+        """
+        for future in self._futures:
+            future.result()
+        self._executor.shutdown()
+        if self._started is not None and self.timings:
+            total = self._finished - self._started
+            logger.info(
+                f"Warm-up finished in {total:.2f}s "
+                f"(sequential would take {sum(self.timings.values()):.2f}s)"
+            )
+            self._started = None